@@ -8,24 +8,31 @@ Run this script to start the application.
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from src.gui.main_window import MainWindow
+
+# Resolved once at import time
+_BASE = os.path.dirname(os.path.abspath(__file__))
+DB_MODEL_PATH = os.path.join(_BASE, 'models', 'supplier_model_from_db.h5')
+
+def train_model_from_db():
+    """Train the database model. Runs on a worker thread after first paint."""
+    try:
+        print("No database-trained model found. Trying to train model from database data...")
+        from src.models.db_model_training import main as train_main
+        train_main()
+    except Exception as e:
+        print(f"Error training model from database: {e}")
+        print("Will use default model instead.")
 
 def main():
     """Main entry point for the application."""
-    # Check if a database-trained model exists and use it
-    model_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
-    db_model_path = os.path.join(model_dir, 'supplier_model_from_db.h5')
+    # GUI imports are deferred so that importing this module stays cheap
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt, QThreadPool
     
-    # If the database-trained model doesn't exist, try to train it first
-    if not os.path.exists(db_model_path) and os.path.isfile(os.path.join('src', 'models', 'db_model_training.py')):
-        try:
-            print("No database-trained model found. Trying to train model from database data...")
-            from src.models.db_model_training import main as train_main
-            train_main()
-        except Exception as e:
-            print(f"Error training model from database: {e}")
-            print("Will use default model instead.")
+    # MainWindow is imported after the application exists, and its pages
+    # import QtWebEngineWidgets; Qt only allows that when OpenGL contexts
+    # are shared, so this must be set before QApplication is created
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     
     # Create the application
     app = QApplication(sys.argv)
@@ -34,8 +41,15 @@ def main():
     app.setStyle('Fusion')
     
     # Create and show the main window
+    from src.gui.main_window import MainWindow
     window = MainWindow()
     window.show()
+    app.processEvents()
+    
+    # If the database-trained model doesn't exist, train it in the
+    # background instead of blocking the first paint
+    if not os.path.isfile(DB_MODEL_PATH):
+        QThreadPool.globalInstance().start(train_model_from_db)
     
     # Start the event loop
     sys.exit(app.exec())
@@ -4,26 +4,139 @@
 import os
 import sqlite3
 import pandas as pd
-from datetime import datetime
 import threading
 import time
+import random
+import itertools
 import contextlib
 import logging
 import traceback
+import atexit
+from queue import Queue, Empty, Full
+from urllib.request import pathname2url
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('EthicSupply.Database')
 
+# Number of read-only connections kept open alongside the single writer
+READER_POOL_SIZE = 4
+
+# Queued activities waiting for the background writer, and how many it
+# commits per transaction
+ACTIVITY_QUEUE_SIZE = 1024
+ACTIVITY_BATCH_SIZE = 256
+
+# Longest a read of recent activities waits for queued ones to be written
+ACTIVITY_READ_WAIT = 0.5
+
+# Tells the background activity writer to exit
+_STOP = object()
+
+# Timestamps are stored as INTEGER epoch microseconds and formatted as local
+# time only when read
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH_US_TO_TEXT = "strftime('%Y-%m-%d %H:%M:%S', {column} / 1000000, 'unixepoch', 'localtime')"
+TEXT_TO_EPOCH_US = "CAST(strftime('%s', {column}, 'utc') AS INTEGER) * 1000000"
+
+RECENT_ACTIVITIES_QUERY = f"""
+    SELECT a.id, {EPOCH_US_TO_TEXT.format(column='a.timestamp')} as timestamp,
+           a.activity_type, a.description, a.details
+    FROM activities a
+    ORDER BY a.timestamp DESC
+    LIMIT ?
+"""
+
+# Numbers connection acquisitions for debug logging
+_connection_counter = itertools.count(1)
+
+# Per-thread RNG for retry jitter
+_retry_state = threading.local()
+
+def _backoff_delay(attempt):
+    """Return a jittered exponential backoff delay in seconds.
+    
+    The upper bound starts at 1 ms and doubles per attempt, capped at 100 ms.
+    Longer waits are left to SQLite's busy_timeout.
+    
+    Args:
+        attempt (int): Zero-based retry attempt.
+    
+    Returns:
+        float: Seconds to sleep before the next attempt.
+    """
+    rng = getattr(_retry_state, 'rng', None)
+    if rng is None:
+        rng = _retry_state.rng = random.Random()
+    return rng.uniform(0, min(0.1, 0.001 * (2 ** attempt)))
+
+class _WriterPool:
+    """A single shared write connection, serialised by a lock."""
+    
+    def __init__(self, conn):
+        """Initialize the writer pool.
+        
+        Args:
+            conn (sqlite3.Connection): The write connection.
+        """
+        self.conn = conn
+        # Re-entrant so a writer can call another writer on the same thread
+        self.lock = threading.RLock()
+    
+    @contextlib.contextmanager
+    def connection(self):
+        """Hold the write connection for the duration of the block.
+        
+        Yields:
+            sqlite3.Connection: The write connection.
+        """
+        with self.lock:
+            yield self.conn
+    
+    def close(self):
+        """Close the write connection."""
+        with self.lock:
+            self.conn.close()
+
+class _ReaderPool:
+    """A fixed set of read-only connections lent to one borrower at a time."""
+    
+    def __init__(self, connections):
+        """Initialize the reader pool.
+        
+        Args:
+            connections (list): Read-only sqlite3.Connection objects.
+        """
+        self.connections = Queue()
+        for conn in connections:
+            self.connections.put(conn)
+    
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a read connection for the duration of the block.
+        
+        Yields:
+            sqlite3.Connection: A read-only connection.
+        """
+        conn = self.connections.get()
+        try:
+            yield conn
+        finally:
+            self.connections.put(conn)
+    
+    def close(self):
+        """Close all read connections."""
+        while not self.connections.empty():
+            self.connections.get_nowait().close()
+
 class Database:
     """SQLite database for storing supplier data and optimization history."""
     
     _instance = None
     _lock = threading.Lock()
-    _connection_count = 0
     
     def __new__(cls, db_path='src/data/ethicsupply.db'):
         """Singleton pattern to ensure only one database instance exists."""
@@ -49,182 +162,319 @@ class Database:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        # Remove any existing WAL files
-        try:
-            wal_file = f"{self.db_path}-wal"
-            shm_file = f"{self.db_path}-shm"
-            if os.path.exists(wal_file):
-                os.remove(wal_file)
-            if os.path.exists(shm_file):
-                os.remove(shm_file)
-            logger.info("Removed existing WAL files")
-        except Exception as e:
-            logger.warning(f"Failed to remove WAL files: {e}")
+        # Open the writer first so the WAL files exist before readers attach
+        self._writer = _WriterPool(self._connect())
         
         # Create tables
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             
-            # Enable foreign keys
-            cursor.execute("PRAGMA foreign_keys=ON")
-            
-            # Create suppliers table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS suppliers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    cost REAL NOT NULL,
-                    co2 REAL NOT NULL,
-                    delivery_time REAL NOT NULL,
-                    ethical_score REAL NOT NULL
-                )
-            ''')
+            # Let SQLite checkpoint any frames left by a previous run and
+            # shrink the WAL back to zero, rather than deleting the files
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             
-            # Create optimizations table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS optimizations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    description TEXT,
-                    num_suppliers INTEGER NOT NULL
-                )
-            ''')
+            # Foreign keys can only be switched off outside a transaction;
+            # with them off, renaming legacy tables below leaves the
+            # REFERENCES clauses of optimization_results untouched
+            cursor.execute("PRAGMA foreign_keys=OFF")
             
-            # Create optimization_results table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS optimization_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    optimization_id INTEGER NOT NULL,
-                    supplier_id INTEGER NOT NULL,
-                    score REAL NOT NULL,
-                    selected INTEGER NOT NULL,
-                    FOREIGN KEY (optimization_id) REFERENCES optimizations (id),
-                    FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-                )
-            ''')
-            
-            # Create activities table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS activities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    activity_type TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    details TEXT
-                )
-            ''')
+            # Rename, recreate, copy and drop in one transaction, so a failed
+            # migration leaves the legacy tables as they were
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Move tables that still store TEXT timestamps out of the way so
+                # they can be recreated with INTEGER timestamps below
+                legacy_tables = self._rename_text_timestamp_tables(cursor)
+                
+                # Create suppliers table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS suppliers (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL,
+                        cost REAL NOT NULL,
+                        co2 REAL NOT NULL,
+                        delivery_time REAL NOT NULL,
+                        ethical_score REAL NOT NULL
+                    )
+                ''')
+                
+                # Create optimizations table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS optimizations (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        timestamp INTEGER NOT NULL,
+                        description TEXT,
+                        num_suppliers INTEGER NOT NULL
+                    )
+                ''')
+                
+                # Create optimization_results table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS optimization_results (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        optimization_id INTEGER NOT NULL,
+                        supplier_id INTEGER NOT NULL,
+                        score REAL NOT NULL,
+                        selected INTEGER NOT NULL,
+                        FOREIGN KEY (optimization_id) REFERENCES optimizations (id),
+                        FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+                    )
+                ''')
+                
+                # Create activities table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS activities (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        timestamp INTEGER NOT NULL,
+                        activity_type TEXT NOT NULL,
+                        description TEXT NOT NULL,
+                        details TEXT
+                    )
+                ''')
+                
+                # Copy rows from the TEXT-timestamp tables, converting the local
+                # time strings to epoch microseconds
+                for table, columns in legacy_tables.items():
+                    select = ', '.join(
+                        TEXT_TO_EPOCH_US.format(column=column) if column == 'timestamp' else column
+                        for column in columns
+                    )
+                    cursor.execute(
+                        f"INSERT INTO {table} ({', '.join(columns)}) "
+                        f"SELECT {select} FROM {table}_text"
+                    )
+                    cursor.execute(f"DROP TABLE {table}_text")
+                    logger.info(f"Converted {table}.timestamp to INTEGER epoch microseconds")
+                
+                # Index the foreign keys used by joins and the timestamps used
+                # by ORDER BY ... LIMIT reads
+                indexes = {
+                    'idx_results_opt': 'optimization_results (optimization_id)',
+                    'idx_results_sup': 'optimization_results (supplier_id)',
+                    'idx_opt_timestamp': 'optimizations (timestamp DESC)',
+                    'idx_activities_timestamp': 'activities (timestamp DESC)'
+                }
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+                existing = {row[0] for row in cursor.fetchall()}
+                for name, target in indexes.items():
+                    cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+                
+                # Gather planner statistics once, when the indexes are new
+                if not existing.issuperset(indexes):
+                    cursor.execute("ANALYZE")
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.execute("PRAGMA foreign_keys=ON")
             
-            conn.commit()
             logger.info("Database tables created successfully")
+        
+        self._readers = _ReaderPool([self._connect(read_only=True) for _ in range(READER_POOL_SIZE)])
+        
+        self._start_activity_writer()
     
-    @contextlib.contextmanager
-    def _get_connection(self):
-        """Get a connection to the database with retry logic.
+    def _rename_text_timestamp_tables(self, cursor):
+        """Rename tables created with a TEXT timestamp column to <table>_text.
         
-        Yields:
-            sqlite3.Connection: A connection to the database.
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the write connection.
+        
+        Returns:
+            dict: Column names of each renamed table, keyed by original name.
         """
-        max_retries = 10
-        retry_delay = 0.5  # seconds
-        last_error = None
-        conn = None
+        renamed = {}
+        for table in ('optimizations', 'activities'):
+            columns = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            types = {column[1]: column[2].upper() for column in columns}
+            if types.get('timestamp') == 'TEXT':
+                renamed[table] = [column[1] for column in columns]
         
-        # Track connection count
-        with self._lock:
-            self._connection_count += 1
-            current_count = self._connection_count
+        if renamed:
+            # Keep foreign keys in optimization_results pointing at the
+            # original table name rather than following the rename
+            cursor.execute("PRAGMA legacy_alter_table=ON")
+            for table in renamed:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_text")
+            cursor.execute("PRAGMA legacy_alter_table=OFF")
         
-        logger.debug(f"Getting connection (count: {current_count})")
+        return renamed
+    
+    def _connect(self, read_only=False):
+        """Open and configure a pooled connection with retry logic.
+        
+        Args:
+            read_only (bool, optional): Open the database in read-only mode.
+                Defaults to False.
+        
+        Returns:
+            sqlite3.Connection: A configured connection to the database.
+        """
+        max_retries = 5
+        
+        if read_only:
+            database = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        else:
+            database = self.db_path
         
         for attempt in range(max_retries):
+            conn = None
             try:
-                # Set timeout to 60 seconds to handle busy database
-                conn = sqlite3.connect(self.db_path, timeout=60.0, isolation_level='EXCLUSIVE')
-                logger.debug(f"Connection established on attempt {attempt + 1}")
-                
-                cursor = conn.cursor()
-                
-                # Configure connection
-                pragmas = [
-                    ("journal_mode", "WAL"),
-                    ("busy_timeout", 60000),
-                    ("foreign_keys", "ON"),
-                    ("synchronous", "NORMAL"),
-                    ("locking_mode", "EXCLUSIVE")
-                ]
-                
-                for pragma, value in pragmas:
-                    cursor.execute(f"PRAGMA {pragma}={value}")
-                    result = cursor.execute(f"PRAGMA {pragma}").fetchone()
-                    logger.debug(f"Set {pragma} to {value}, got {result[0]}")
-                
-                yield conn
-                
-                # Commit any pending transactions
-                if conn.in_transaction:
-                    logger.debug("Committing pending transaction")
-                    conn.commit()
+                # Set timeout to 60 seconds to handle busy database. Pooled
+                # connections are shared across threads, one user at a time.
+                # Transactions are started explicitly with BEGIN IMMEDIATE.
+                conn = sqlite3.connect(
+                    database,
+                    timeout=60.0,
+                    isolation_level=None,
+                    uri=read_only,
+                    check_same_thread=False
+                )
+                logger.debug("Connection established on attempt %d", attempt + 1)
                 
-                return
+                self._init_connection(conn, read_only)
+                return conn
             except sqlite3.OperationalError as e:
-                last_error = e
+                if conn:
+                    conn.close()
                 logger.warning(f"Database error on attempt {attempt + 1}: {e}")
                 if "database is locked" in str(e) and attempt < max_retries - 1:
-                    time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
+                    time.sleep(_backoff_delay(attempt))
                     continue
                 logger.error(f"Database error: {e}\n{traceback.format_exc()}")
                 raise
-            except Exception as e:
-                last_error = e
-                logger.error(f"Unexpected error: {e}\n{traceback.format_exc()}")
-                raise
-            finally:
-                if conn:
-                    try:
-                        conn.close()
-                        logger.debug("Connection closed")
-                    except Exception as e:
-                        logger.warning(f"Error closing connection: {e}")
+    
+    def _init_connection(self, conn, read_only=False):
+        """Apply connection settings once, when a connection joins a pool.
+        
+        Args:
+            conn (sqlite3.Connection): The connection to configure.
+            read_only (bool, optional): Whether this is a read-only connection.
+                Defaults to False.
+        """
+        cursor = conn.cursor()
+        
+        # Configure connection
+        pragmas = [
+            ("busy_timeout", 60000),
+            ("foreign_keys", "ON"),
+            ("synchronous", "NORMAL"),
+            ("cache_size", -65536),  # 64 MB page cache
+            ("temp_store", "MEMORY")
+        ]
+        
+        # WAL is persistent in the database file, so only the writer sets it
+        if not read_only:
+            pragmas.insert(0, ("journal_mode", "WAL"))
+        
+        for pragma, value in pragmas:
+            cursor.execute(f"PRAGMA {pragma}={value}")
+            logger.debug("Set %s to %s", pragma, value)
+        
+        cursor.close()
+    
+    @contextlib.contextmanager
+    def _track_connection(self, pool):
+        """Borrow a connection from a pool, numbering each acquisition.
+        
+        Args:
+            pool (_WriterPool or _ReaderPool): The pool to borrow from.
+        
+        Yields:
+            sqlite3.Connection: A connection to the database.
+        """
+        # itertools.count is atomic under the GIL, so no lock is needed
+        logger.debug("Getting connection (count: %d)", next(_connection_counter))
+        
+        with pool.connection() as conn:
+            yield conn
+    
+    @contextlib.contextmanager
+    def _get_writer(self):
+        """Get the write connection.
+        
+        Yields:
+            sqlite3.Connection: The shared write connection.
+        """
+        with self._track_connection(self._writer) as conn:
+            try:
+                yield conn
                 
-                with self._lock:
-                    self._connection_count -= 1
-                    logger.debug(f"Connection count decreased to {self._connection_count}")
+                # Commit any pending transactions
+                if conn.in_transaction:
+                    logger.debug("Committing pending transaction")
+                    conn.commit()
+            except Exception:
+                # The connection outlives this call, so never leave a
+                # failed transaction open on it
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+    
+    def _get_reader(self):
+        """Get a read-only connection.
         
-        if last_error:
-            raise last_error
+        Returns:
+            contextlib.AbstractContextManager: Yields a pooled read-only connection.
+        """
+        return self._track_connection(self._readers)
     
-    def save_suppliers(self, suppliers_df):
+    def close(self):
+        """Flush queued activities and close all pooled connections."""
+        self._stop_activity_writer()
+        self._readers.close()
+        self._writer.close()
+    
+    def _insert_suppliers(self, cursor, suppliers_df):
+        """Insert suppliers on a cursor whose transaction is already open.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the write connection.
+            suppliers_df (pandas.DataFrame): DataFrame containing supplier data.
+            
+        Returns:
+            list: List of supplier IDs.
+        """
+        rows = list(suppliers_df[['name', 'cost', 'co2', 'delivery_time', 'ethical_score']]
+                    .itertuples(index=False, name=None))
+        cursor.executemany('''
+            INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        
+        # AUTOINCREMENT IDs are contiguous within one transaction, and
+        # executemany() does not update cursor.lastrowid
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1)) if rows else []
+    
+    def save_suppliers(self, suppliers_df, cursor=None):
         """Save suppliers to the database.
         
         Args:
             suppliers_df (pandas.DataFrame): DataFrame containing supplier data.
+            cursor (sqlite3.Cursor, optional): Cursor of a write transaction the
+                caller has already started. The rows are then inserted as part of
+                that transaction and the caller commits. Defaults to None.
             
         Returns:
             list: List of supplier IDs.
         """
         logger.info(f"Saving {len(suppliers_df)} suppliers")
         
-        with self._get_connection() as conn:
+        if cursor is not None:
+            return self._insert_suppliers(cursor, suppliers_df)
+        
+        with self._get_writer() as conn:
             cursor = conn.cursor()
-            supplier_ids = []
             
             try:
                 # Start transaction
-                cursor.execute("BEGIN EXCLUSIVE")
-                logger.debug("Started EXCLUSIVE transaction")
+                cursor.execute("BEGIN IMMEDIATE")
+                logger.debug("Started IMMEDIATE transaction")
                 
-                for _, row in suppliers_df.iterrows():
-                    cursor.execute('''
-                        INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        row['name'],
-                        row['cost'],
-                        row['co2'],
-                        row['delivery_time'],
-                        row['ethical_score']
-                    ))
-                    supplier_ids.append(cursor.lastrowid)
+                supplier_ids = self._insert_suppliers(cursor, suppliers_df)
                 
                 # Commit transaction
                 conn.commit()
@@ -236,6 +486,36 @@ class Database:
                 logger.error(f"Error saving suppliers: {e}\n{traceback.format_exc()}")
                 raise e
     
+    def _fetch(self, query, params=()):
+        """Run a read query and return the raw rows with their column names.
+        
+        Args:
+            query (str): SQL query to run.
+            params (tuple, optional): Query parameters. Defaults to ().
+            
+        Returns:
+            tuple: (list of row tuples, list of column names).
+        """
+        with self._get_reader() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                return cursor.fetchall(), [d[0] for d in cursor.description]
+            finally:
+                cursor.close()
+    
+    def _fetch_df(self, query, params=()):
+        """Run a small read query into a DataFrame without read_sql_query.
+        
+        Args:
+            query (str): SQL query to run.
+            params (tuple, optional): Query parameters. Defaults to ().
+            
+        Returns:
+            pandas.DataFrame: The query result.
+        """
+        rows, columns = self._fetch(query, params)
+        return pd.DataFrame.from_records(rows, columns=columns)
+    
     def get_suppliers(self):
         """Get all suppliers from the database.
         
@@ -244,7 +524,7 @@ class Database:
         """
         logger.info("Fetching all suppliers")
         
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             query = "SELECT id, name, cost, co2, delivery_time, ethical_score FROM suppliers"
             df = pd.read_sql_query(query, conn)
             logger.info(f"Retrieved {len(df)} suppliers")
@@ -262,16 +542,20 @@ class Database:
         """
         logger.info(f"Saving optimization with {len(suppliers_df)} suppliers")
         
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             
             try:
                 # Start transaction
-                cursor.execute("BEGIN EXCLUSIVE")
-                logger.debug("Started EXCLUSIVE transaction")
+                cursor.execute("BEGIN IMMEDIATE")
+                logger.debug("Started IMMEDIATE transaction")
                 
-                # Get current timestamp
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                # Get current timestamp once and reuse it for the default description
+                timestamp = time.time_ns() // 1000
+                if not description:
+                    description = "Optimization run at " + time.strftime(
+                        TIMESTAMP_FORMAT, time.localtime(timestamp / 1000000)
+                    )
                 
                 # Insert optimization
                 cursor.execute('''
@@ -279,27 +563,27 @@ class Database:
                     VALUES (?, ?, ?)
                 ''', (
                     timestamp,
-                    description or f"Optimization run at {timestamp}",
+                    description,
                     len(suppliers_df)
                 ))
                 
                 optimization_id = cursor.lastrowid
-                logger.debug(f"Created optimization with ID {optimization_id}")
+                logger.debug("Created optimization with ID %d", optimization_id)
                 
-                # Save supplier IDs if they don't exist
-                supplier_ids = self.save_suppliers(suppliers_df[['name', 'cost', 'co2', 'delivery_time', 'ethical_score']])
+                # Save suppliers in this transaction, so a failure below
+                # also rolls them back
+                supplier_ids = self.save_suppliers(suppliers_df, cursor=cursor)
                 
                 # Insert optimization results
-                for i, (_, row) in enumerate(suppliers_df.iterrows()):
-                    cursor.execute('''
-                        INSERT INTO optimization_results (optimization_id, supplier_id, score, selected)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        optimization_id,
-                        supplier_ids[i],
-                        row['predicted_score'],
-                        1 if i < 3 else 0  # Select top 3 suppliers
-                    ))
+                scores = suppliers_df['predicted_score'].to_numpy()
+                params = [
+                    (optimization_id, supplier_id, float(scores[i]), 1 if i < 3 else 0)  # Select top 3 suppliers
+                    for i, supplier_id in enumerate(supplier_ids)
+                ]
+                cursor.executemany('''
+                    INSERT INTO optimization_results (optimization_id, supplier_id, score, selected)
+                    VALUES (?, ?, ?, ?)
+                ''', params)
                 
                 # Commit transaction
                 conn.commit()
@@ -322,16 +606,16 @@ class Database:
         """
         logger.info(f"Fetching {limit} recent optimizations")
         
-        with self._get_connection() as conn:
-            query = f"""
-                SELECT id, timestamp, description, num_suppliers 
-                FROM optimizations 
-                ORDER BY timestamp DESC 
-                LIMIT {limit}
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} optimizations")
-            return df
+        query = f"""
+            SELECT o.id, {EPOCH_US_TO_TEXT.format(column='o.timestamp')} as timestamp,
+                   o.description, o.num_suppliers
+            FROM optimizations o
+            ORDER BY o.timestamp DESC 
+            LIMIT ?
+        """
+        df = self._fetch_df(query, (int(limit),))
+        logger.info(f"Retrieved {len(df)} optimizations")
+        return df
     
     def get_optimization_results(self, optimization_id):
         """Get results for a specific optimization.
@@ -344,17 +628,16 @@ class Database:
         """
         logger.info(f"Fetching results for optimization {optimization_id}")
         
-        with self._get_connection() as conn:
-            query = f"""
-                SELECT s.name, s.cost, s.co2, s.delivery_time, s.ethical_score, r.score as predicted_score, r.selected
-                FROM optimization_results r
-                JOIN suppliers s ON r.supplier_id = s.id
-                WHERE r.optimization_id = {optimization_id}
-                ORDER BY r.score DESC
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} results")
-            return df
+        query = """
+            SELECT s.name, s.cost, s.co2, s.delivery_time, s.ethical_score, r.score as predicted_score, r.selected
+            FROM optimization_results r
+            JOIN suppliers s ON r.supplier_id = s.id
+            WHERE r.optimization_id = ?
+            ORDER BY r.score DESC
+        """
+        df = self._fetch_df(query, (int(optimization_id),))
+        logger.info(f"Retrieved {len(df)} results")
+        return df
     
     def get_optimization_trends(self, limit=7):
         """Get optimization trends for the last N optimizations.
@@ -367,9 +650,9 @@ class Database:
         """
         logger.info(f"Fetching optimization trends for last {limit} optimizations")
         
-        with self._get_connection() as conn:
+        with self._get_reader() as conn:
             query = f"""
-                SELECT o.timestamp, 
+                SELECT {EPOCH_US_TO_TEXT.format(column='o.timestamp')} as timestamp, 
                        AVG(CASE WHEN r.selected = 1 THEN s.cost ELSE NULL END) as avg_cost,
                        AVG(CASE WHEN r.selected = 1 THEN s.co2 ELSE NULL END) as avg_co2,
                        AVG(CASE WHEN r.selected = 1 THEN s.delivery_time ELSE NULL END) as avg_delivery,
@@ -379,9 +662,9 @@ class Database:
                 JOIN suppliers s ON r.supplier_id = s.id
                 GROUP BY o.id
                 ORDER BY o.timestamp DESC
-                LIMIT {limit}
+                LIMIT ?
             """
-            df = pd.read_sql_query(query, conn)
+            df = pd.read_sql_query(query, conn, params=(int(limit),))
             
             # Reverse the order to have chronological order
             if not df.empty:
@@ -390,40 +673,148 @@ class Database:
             logger.info(f"Retrieved trends for {len(df)} optimizations")
             return df
     
-    def log_activity(self, activity_type, description, details=None):
-        """Log an activity to the database.
+    def _start_activity_writer(self):
+        """Start the background thread that writes queued activities."""
+        self._activity_queue = Queue(maxsize=ACTIVITY_QUEUE_SIZE)
+        self._activity_thread = threading.Thread(
+            target=self._activity_flusher,
+            name='EthicSupply-activity-writer',
+            daemon=True
+        )
+        self._activity_thread.start()
+        atexit.register(self._stop_activity_writer)
+    
+    def _stop_activity_writer(self):
+        """Write any queued activities and stop the background writer."""
+        if self._activity_thread.is_alive():
+            self._activity_queue.put(_STOP)
+            self._activity_thread.join(timeout=10.0)
+        if not self._activity_thread.is_alive():
+            self._drain_activity_queue()
+    
+    def _drain_activity_queue(self):
+        """Write activities queued after the writer exited.
+        
+        log_activity can enqueue between its liveness check and the writer
+        taking its stop marker; writing those rows here keeps task_done()
+        balanced so waiting readers are not left hanging.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._activity_queue.get_nowait())
+            except Empty:
+                break
+        
+        rows = [item for item in batch if item is not _STOP]
+        try:
+            if rows:
+                self._insert_activities(rows)
+        except Exception:
+            # Already logged by _insert_activities
+            pass
+        finally:
+            for _ in batch:
+                self._activity_queue.task_done()
+    
+    def _wait_for_activities(self, timeout):
+        """Wait until the activity queue is drained or the timeout expires.
         
         Args:
-            activity_type (str): Type of activity (e.g., 'input', 'optimize', 'export').
-            description (str): Description of the activity.
-            details (str, optional): Additional details about the activity.
+            timeout (float): Maximum number of seconds to wait.
+            
+        Returns:
+            bool: True if no activities were left unwritten.
         """
-        logger.info(f"Logging activity: {activity_type} - {description}")
+        queue = self._activity_queue
+        with queue.all_tasks_done:
+            if not self._activity_thread.is_alive():
+                return queue.unfinished_tasks == 0
+            return queue.all_tasks_done.wait_for(
+                lambda: queue.unfinished_tasks == 0, timeout=timeout
+            )
+    
+    def _activity_flusher(self):
+        """Drain the activity queue, committing each batch in one transaction."""
+        while True:
+            batch = [self._activity_queue.get()]
+            while len(batch) < ACTIVITY_BATCH_SIZE:
+                try:
+                    batch.append(self._activity_queue.get_nowait())
+                except Empty:
+                    break
+            
+            rows = [item for item in batch if item is not _STOP]
+            try:
+                if rows:
+                    self._insert_activities(rows)
+            except Exception:
+                # Already logged by _insert_activities; keep the writer alive
+                pass
+            finally:
+                for _ in batch:
+                    self._activity_queue.task_done()
+            
+            if len(rows) < len(batch):
+                return
+    
+    def _insert_activities(self, rows):
+        """Insert activity rows in a single transaction.
         
-        with self._get_connection() as conn:
+        Args:
+            rows (list): (timestamp, activity_type, description, details) tuples.
+        """
+        with self._get_writer() as conn:
             cursor = conn.cursor()
             
             try:
                 # Start transaction
-                cursor.execute("BEGIN EXCLUSIVE")
-                logger.debug("Started EXCLUSIVE transaction")
-                
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                cursor.execute("BEGIN IMMEDIATE")
+                logger.debug("Started IMMEDIATE transaction")
                 
-                cursor.execute('''
+                cursor.executemany('''
                     INSERT INTO activities (timestamp, activity_type, description, details)
                     VALUES (?, ?, ?, ?)
-                ''', (timestamp, activity_type, description, details))
+                ''', rows)
                 
                 # Commit transaction
                 conn.commit()
-                logger.info("Activity logged successfully")
+                logger.debug("Wrote %d activities", len(rows))
             except Exception as e:
                 # Rollback transaction on error
                 conn.rollback()
                 logger.error(f"Error logging activity: {e}\n{traceback.format_exc()}")
                 raise e
     
+    def log_activity(self, activity_type, description, details=None, sync=False):
+        """Log an activity to the database.
+        
+        Activities are queued and committed in batches by a background thread.
+        
+        Args:
+            activity_type (str): Type of activity (e.g., 'input', 'optimize', 'export').
+            description (str): Description of the activity.
+            details (str, optional): Additional details about the activity.
+            sync (bool, optional): Write the activity before returning instead of
+                queueing it. Defaults to False.
+        """
+        logger.info(f"Logging activity: {activity_type} - {description}")
+        
+        row = (time.time_ns() // 1000, activity_type, description, details)
+        
+        if not sync and self._activity_thread.is_alive():
+            try:
+                self._activity_queue.put_nowait(row)
+                # The writer may have stopped after the check above
+                if not self._activity_thread.is_alive():
+                    self._drain_activity_queue()
+                return
+            except Full:
+                logger.warning("Activity queue is full, writing synchronously")
+        
+        self._insert_activities([row])
+        logger.info("Activity logged successfully")
+    
     def get_recent_activities(self, limit=10):
         """Get recent activities from the database.
         
@@ -435,35 +826,42 @@ class Database:
         """
         logger.info(f"Fetching {limit} recent activities")
         
-        with self._get_connection() as conn:
-            query = f"""
-                SELECT id, timestamp, activity_type, description, details
-                FROM activities
-                ORDER BY timestamp DESC
-                LIMIT {limit}
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} activities")
-            return df
+        # Give queued activities a moment to be written so callers usually
+        # see their own writes
+        self._wait_for_activities(ACTIVITY_READ_WAIT)
+        
+        rows, columns = self._fetch(RECENT_ACTIVITIES_QUERY, (int(limit),))
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        logger.info(f"Retrieved {len(df)} activities")
+        return df
+    
+    def get_recent_activities_rows(self, limit=10):
+        """Get recent activities as plain tuples, skipping DataFrame construction.
+        
+        Args:
+            limit (int, optional): Maximum number of activities to return. Defaults to 10.
+            
+        Returns:
+            list: (id, timestamp, activity_type, description, details) tuples.
+        """
+        self._wait_for_activities(ACTIVITY_READ_WAIT)
+        rows, _ = self._fetch(RECENT_ACTIVITIES_QUERY, (int(limit),))
+        return rows
 
 if __name__ == "__main__":
     # Test the database functionality
     import numpy as np
     
     # Generate sample data
-    suppliers = []
-    for i in range(1, 16):
-        supplier = {
-            'name': f"Supplier_{i:04d}",
-            'cost': np.random.uniform(100, 1000),
-            'co2': np.random.uniform(100, 500),
-            'delivery_time': np.random.uniform(1, 30),
-            'ethical_score': np.random.uniform(0, 100),
-            'predicted_score': np.random.uniform(0, 100)
-        }
-        suppliers.append(supplier)
-    
-    df = pd.DataFrame(suppliers)
+    n = 15
+    df = pd.DataFrame({
+        'name': [f"Supplier_{i:04d}" for i in range(1, n + 1)],
+        'cost': np.random.uniform(100, 1000, n),
+        'co2': np.random.uniform(100, 500, n),
+        'delivery_time': np.random.uniform(1, 30, n),
+        'ethical_score': np.random.uniform(0, 100, n),
+        'predicted_score': np.random.uniform(0, 100, n)
+    })
     
     # Initialize database
     db = Database()
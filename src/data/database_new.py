@@ -2,44 +2,163 @@
 # -*- coding: utf-8 -*-
 
 import os
+import atexit
+import contextlib
+import functools
 import sqlite3
 import pandas as pd
-from datetime import datetime
+import numpy as np
 import threading
 import time
 import logging
+from queue import Queue, Empty, Full
+from urllib.request import pathname2url
 
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger('EthicSupply.Database')
 
+# Timestamps are stored as INTEGER epoch microseconds and formatted as local
+# time only when read
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH_US_TO_TEXT = "strftime('%Y-%m-%d %H:%M:%S', {column} / 1000000, 'unixepoch', 'localtime')"
+TEXT_TO_EPOCH_US = "CAST(strftime('%s', {column}, 'utc') AS INTEGER) * 1000000"
+
+# Bump when the DDL in _setup_database changes
+SCHEMA_VERSION = 7
+
+# Per-connection settings. journal_mode=WAL is persistent and is set once
+# in _setup_database.
+CONNECTION_PRAGMAS = """
+    PRAGMA foreign_keys=ON;
+    PRAGMA busy_timeout=60000;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Queued activities waiting for the background writer, and how many it
+# commits per transaction
+ACTIVITY_QUEUE_SIZE = 1024
+ACTIVITY_BATCH_SIZE = 256
+
+# Longest a read of recent activities waits for queued ones to be written
+ACTIVITY_READ_WAIT = 0.5
+
+# Tells the background activity writer to exit
+_STOP = object()
+
+# Suppliers are upserted with multi-row VALUES statements of up to this many
+# rows; 190 rows x 5 columns stays under SQLite's default 999 bound parameters
+MULTI_ROW_INSERT_CHUNK = 190
+
+# Read-only connections kept open alongside the single writer
+READER_POOL_SIZE = os.cpu_count() or 4
+
+# Prepared statements kept per connection; the default is 128
+STATEMENT_CACHE_SIZE = 256
+
+# Statements are kept as module constants so every call passes the same SQL
+# text and reuses the connection's prepared statement
+UPSERT_SUPPLIERS_PREFIX = "INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score) VALUES "
+UPSERT_SUPPLIERS_SUFFIX = """
+    ON CONFLICT (name) DO UPDATE SET
+        cost = excluded.cost,
+        co2 = excluded.co2,
+        delivery_time = excluded.delivery_time,
+        ethical_score = excluded.ethical_score
+    RETURNING name, id
+"""
+INSERT_OPTIMIZATION = """
+    INSERT INTO optimizations (timestamp, description, num_suppliers)
+    VALUES (?, ?, ?)
+"""
+# A supplier listed twice in one run keeps its last row
+INSERT_RESULT = """
+    INSERT OR REPLACE INTO optimization_results (
+        optimization_id, supplier_id, score, selected,
+        cost, co2, delivery_time, ethical_score
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_ACTIVITY = """
+    INSERT INTO activities (timestamp, activity_type, description, details)
+    VALUES (?, ?, ?, ?)
+"""
+
+SUPPLIERS_QUERY = "SELECT id, name, cost, co2, delivery_time, ethical_score FROM suppliers"
+OPTIMIZATIONS_QUERY = f"""
+    SELECT o.id, {EPOCH_US_TO_TEXT.format(column='o.timestamp')} as timestamp,
+           o.description, o.num_suppliers
+    FROM optimizations o
+    ORDER BY o.timestamp DESC
+    LIMIT ?
+"""
+OPTIMIZATION_RESULTS_QUERY = """
+    SELECT s.name, r.cost, r.co2, r.delivery_time, r.ethical_score, r.score as predicted_score, r.selected
+    FROM optimization_results r
+    JOIN suppliers s ON r.supplier_id = s.id
+    WHERE r.optimization_id = ?
+    ORDER BY r.score DESC
+"""
+# Picks the latest runs first so only their selected results are aggregated,
+# and returns them oldest-first for charting. The metrics are copied onto
+# optimization_results at write time, so suppliers is not joined.
+OPTIMIZATION_TRENDS_QUERY = f"""
+    WITH recent AS (
+        SELECT id, timestamp
+        FROM optimizations
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+    )
+    SELECT {EPOCH_US_TO_TEXT.format(column='o.timestamp')} as timestamp, 
+           AVG(r.cost) as avg_cost,
+           AVG(r.co2) as avg_co2,
+           AVG(r.delivery_time) as avg_delivery,
+           AVG(r.ethical_score) as avg_ethical
+    FROM recent o
+    JOIN optimization_results r ON o.id = r.optimization_id AND r.selected = 1
+    GROUP BY o.id, o.timestamp
+    ORDER BY o.timestamp ASC, o.id ASC
+"""
+RECENT_ACTIVITIES_QUERY = f"""
+    SELECT a.id, {EPOCH_US_TO_TEXT.format(column='a.timestamp')} as timestamp,
+           a.activity_type, a.description, a.details
+    FROM activities a
+    ORDER BY a.timestamp DESC
+    LIMIT ?
+"""
+
 class Database:
-    """SQLite database for storing supplier data and optimization history."""
-    
-    _instance = None
-    _lock = threading.Lock()
-    
-    def __new__(cls, db_path='ethicsupply_new.db'):
-        """Singleton pattern to ensure only one database instance exists."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(Database, cls).__new__(cls)
-                cls._instance.db_path = os.path.join(os.path.dirname(__file__), db_path)
-                cls._instance.connection_lock = threading.Lock()
-                cls._instance._setup_database()
-            return cls._instance
-    
-    def __init__(self, db_path='ethicsupply_new.db'):
+    """SQLite database for storing supplier data and optimization history.
+    
+    Use get_database() to share one instance per database file.
+    """
+    
+    def __init__(self, db_path='ethicsupply_new.db', snapshot_interval=None):
         """Initialize the database.
         
         Args:
             db_path (str, optional): Path to the database file. 
                 Defaults to 'ethicsupply_new.db'.
+            snapshot_interval (float, optional): If set, serve the polled
+                getters (optimizations, trends, activities) from an in-memory
+                copy of the database refreshed every this many seconds.
+                Defaults to None, which reads the file directly.
         """
-        pass  # Initialization is done in __new__
+        self.db_path = os.path.join(os.path.dirname(__file__), db_path)
+        self._setup_database()
+        self._open_connections()
+        self._start_activity_writer()
+        self._start_snapshot(snapshot_interval)
+        # Flush queued activities and close the cached per-thread
+        # connections on interpreter exit
+        self._closed = False
+        atexit.register(self.close)
     
     def _setup_database(self):
         """Set up the database and create tables."""
@@ -51,8 +170,29 @@ class Database:
         cursor = conn.cursor()
         
         try:
-            # Enable foreign keys
-            cursor.execute("PRAGMA foreign_keys=ON")
+            # WAL mode is persistent, so it only needs to be set once per file
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
+            # Skip the DDL entirely once the file is at the current schema
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                logger.info(f"Database schema is up to date (version {version})")
+                return
+            
+            # Foreign keys stay off on this connection, so renaming legacy
+            # tables below leaves the REFERENCES clauses untouched
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # optimization_results used to carry an unused AUTOINCREMENT id
+            # and no copy of the supplier metrics. Move an old table aside so
+            # it is rebuilt WITHOUT ROWID, with the metrics, below.
+            result_columns = [row[1] for row in cursor.execute("PRAGMA table_info(optimization_results)")]
+            legacy_results = bool(result_columns) and 'cost' not in result_columns
+            if legacy_results:
+                cursor.execute("ALTER TABLE optimization_results RENAME TO optimization_results_legacy")
+            
+            # Likewise for tables that still store TEXT timestamps
+            legacy_tables = self._rename_text_timestamp_tables(cursor)
             
             # Create suppliers table
             cursor.execute('''
@@ -70,7 +210,7 @@ class Database:
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS optimizations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     description TEXT,
                     num_suppliers INTEGER NOT NULL
                 )
@@ -79,52 +219,323 @@ class Database:
             # Create optimization_results table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS optimization_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     optimization_id INTEGER NOT NULL,
                     supplier_id INTEGER NOT NULL,
                     score REAL NOT NULL,
                     selected INTEGER NOT NULL,
+                    cost REAL NOT NULL,
+                    co2 REAL NOT NULL,
+                    delivery_time REAL NOT NULL,
+                    ethical_score REAL NOT NULL,
+                    PRIMARY KEY (optimization_id, supplier_id),
                     FOREIGN KEY (optimization_id) REFERENCES optimizations (id),
                     FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-                )
+                ) WITHOUT ROWID
             ''')
             
+            if legacy_results:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO optimization_results (
+                        optimization_id, supplier_id, score, selected,
+                        cost, co2, delivery_time, ethical_score
+                    )
+                    SELECT r.optimization_id, r.supplier_id, r.score, r.selected,
+                           s.cost, s.co2, s.delivery_time, s.ethical_score
+                    FROM optimization_results_legacy r
+                    JOIN suppliers s ON r.supplier_id = s.id
+                ''')
+                # Also drops the old indexes, which are recreated below
+                cursor.execute("DROP TABLE optimization_results_legacy")
+                logger.info("Rebuilt optimization_results with the supplier metrics")
+            
             # Create activities table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS activities (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     activity_type TEXT NOT NULL,
                     description TEXT NOT NULL,
                     details TEXT
                 )
             ''')
             
+            # Copy rows from the TEXT-timestamp tables, converting the local
+            # time strings to epoch microseconds
+            for table, columns in legacy_tables.items():
+                select = ', '.join(
+                    TEXT_TO_EPOCH_US.format(column=column) if column == 'timestamp' else column
+                    for column in columns
+                )
+                cursor.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"SELECT {select} FROM {table}_text"
+                )
+                cursor.execute(f"DROP TABLE {table}_text")
+                logger.info(f"Converted {table}.timestamp to INTEGER epoch microseconds")
+            
+            # Suppliers used to be inserted again on every run. Keep the
+            # newest row for each name and point old results at it; the
+            # results carry their own copy of the metrics.
+            if 'idx_suppliers_name' not in {
+                row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }:
+                cursor.execute('''
+                    CREATE TEMP TABLE latest_suppliers AS
+                    SELECT s.id, MAX(k.id) AS keep_id
+                    FROM suppliers s
+                    JOIN suppliers k ON k.name = s.name
+                    GROUP BY s.id
+                ''')
+                cursor.execute('''
+                    UPDATE OR IGNORE optimization_results
+                    SET supplier_id = (
+                        SELECT keep_id FROM latest_suppliers WHERE id = optimization_results.supplier_id
+                    )
+                    WHERE supplier_id IN (SELECT id FROM latest_suppliers WHERE id != keep_id)
+                ''')
+                # Rows left behind duplicated a supplier within one run
+                cursor.execute('''
+                    DELETE FROM optimization_results
+                    WHERE supplier_id IN (SELECT id FROM latest_suppliers WHERE id != keep_id)
+                ''')
+                cursor.execute("DELETE FROM suppliers WHERE id IN (SELECT id FROM latest_suppliers WHERE id != keep_id)")
+                cursor.execute("DROP TABLE latest_suppliers")
+                cursor.execute("CREATE UNIQUE INDEX idx_suppliers_name ON suppliers (name)")
+            
+            # Index the join/filter columns. Lookups by optimization_id are
+            # range scans of the primary key, which stores the whole row.
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_results_sup
+                ON optimization_results (supplier_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_results_sel
+                ON optimization_results (optimization_id, selected, supplier_id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_opt_ts
+                ON optimizations (timestamp DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_act_ts
+                ON activities (timestamp DESC)
+            ''')
+            
+            cursor.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
             conn.commit()
+            
+            # Refresh planner statistics so the new indexes get picked up
+            cursor.execute("ANALYZE")
             logger.info("Database tables created successfully")
         finally:
             cursor.close()
             conn.close()
     
-    def _get_connection(self):
-        """Get a connection to the database.
+    def _rename_text_timestamp_tables(self, cursor):
+        """Rename tables created with a TEXT timestamp column to <table>_text.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the setup connection.
+        
+        Returns:
+            dict: Column names of each renamed table, keyed by original name.
+        """
+        renamed = {}
+        for table in ('optimizations', 'activities'):
+            columns = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            types = {column[1]: column[2].upper() for column in columns}
+            if types.get('timestamp') == 'TEXT':
+                renamed[table] = [column[1] for column in columns]
+        
+        if renamed:
+            # Keep foreign keys in optimization_results pointing at the
+            # original table name rather than following the rename
+            cursor.execute("PRAGMA legacy_alter_table=ON")
+            for table in renamed:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_text")
+            cursor.execute("PRAGMA legacy_alter_table=OFF")
+        
+        return renamed
+    
+    def _connect(self, read_only=False):
+        """Open and configure a connection to the database.
+        
+        Args:
+            read_only (bool, optional): Open the file in read-only mode.
+                Defaults to False.
         
         Returns:
             sqlite3.Connection: A connection to the database.
         """
-        # Set timeout to 60 seconds to handle busy database
-        conn = sqlite3.connect(self.db_path, timeout=60.0)
+        if read_only:
+            target = 'file:' + pathname2url(self.db_path) + '?mode=ro'
+        else:
+            target = self.db_path
         
-        # Configure connection
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.execute("PRAGMA busy_timeout=60000")
-        cursor.close()
+        # Set timeout to 60 seconds to handle busy database. Pooled
+        # connections are handed to whichever thread borrows them.
+        conn = sqlite3.connect(
+            target,
+            timeout=60.0,
+            uri=read_only,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
         
+        # Configure connection in a single call
+        conn.executescript(CONNECTION_PRAGMAS)
         return conn
     
+    def _open_connections(self):
+        """Open the single write connection and the pool of read connections.
+        
+        Each connection is paired with one cursor that is reused for every
+        statement run on it.
+        """
+        self._write_conn = self._connect()
+        self._write_cursor = self._write_conn.cursor()
+        self._write_lock = threading.Lock()
+        
+        self._readers = Queue()
+        for _ in range(READER_POOL_SIZE):
+            conn = self._connect(read_only=True)
+            self._readers.put((conn, conn.cursor()))
+    
+    @contextlib.contextmanager
+    def _writer(self):
+        """Hold the write connection for the duration of the block.
+        
+        SQLite allows one writer at a time, so writes are serialised here
+        rather than on the file lock.
+        
+        Yields:
+            tuple: The write connection and its cursor.
+        """
+        with self._write_lock:
+            yield self._write_conn, self._write_cursor
+    
+    @contextlib.contextmanager
+    def _reader(self):
+        """Borrow a read-only connection for the duration of the block.
+        
+        In WAL mode these read alongside the writer without blocking.
+        
+        Yields:
+            tuple: A read-only connection and its cursor.
+        """
+        reader = self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put(reader)
+    
+    def close(self):
+        """Flush queued activities and close all pooled connections.
+        
+        Safe to call more than once; only the first call does anything.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        
+        self._stop_activity_writer()
+        self._stop_snapshot()
+        with self._write_lock:
+            # Let SQLite refresh statistics the queries above relied on
+            try:
+                self._write_conn.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.warning(f"Error optimizing database: {e}")
+            self._write_conn.close()
+        while not self._readers.empty():
+            conn, _ = self._readers.get_nowait()
+            conn.close()
+    
+    def _start_snapshot(self, interval):
+        """Copy the database into memory and keep refreshing the copy.
+        
+        Args:
+            interval (float): Seconds between refreshes, or None to disable.
+        """
+        self._snapshot = None
+        self._snapshot_thread = None
+        if interval is None:
+            return
+        
+        self._snapshot = sqlite3.connect(':memory:', check_same_thread=False)
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_stop = threading.Event()
+        self._refresh_snapshot()
+        
+        self._snapshot_thread = threading.Thread(
+            target=self._snapshot_refresher,
+            args=(interval,),
+            name='EthicSupply-snapshot',
+            daemon=True
+        )
+        self._snapshot_thread.start()
+    
+    def _stop_snapshot(self):
+        """Stop refreshing the in-memory copy and discard it."""
+        if self._snapshot_thread is not None:
+            self._snapshot_stop.set()
+            self._snapshot_thread.join(timeout=10.0)
+            self._snapshot_thread = None
+        if self._snapshot is not None:
+            with self._snapshot_lock:
+                self._snapshot.close()
+            self._snapshot = None
+    
+    def _refresh_snapshot(self):
+        """Copy the current database pages into the in-memory snapshot."""
+        with self._snapshot_lock, self._reader() as (conn, _):
+            conn.backup(self._snapshot)
+    
+    def _snapshot_refresher(self, interval):
+        """Refresh the snapshot every interval seconds until stopped."""
+        while not self._snapshot_stop.wait(interval):
+            try:
+                self._refresh_snapshot()
+            except Exception as e:
+                logger.warning(f"Error refreshing database snapshot: {e}")
+    
+    def _save_suppliers(self, cursor, suppliers_df):
+        """Upsert suppliers using an existing cursor inside an open transaction.
+        
+        Suppliers are keyed by name; saving a known name updates its metrics
+        and returns its existing ID.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor of the connection owning the transaction.
+            suppliers_df (pandas.DataFrame): DataFrame containing supplier data.
+            
+        Returns:
+            list: List of supplier IDs, in DataFrame order.
+        """
+        # Build the row tuples column-wise; tolist() also turns NumPy scalars
+        # into Python values sqlite3 can bind
+        rows = list(zip(*(
+            suppliers_df[column].to_numpy().tolist()
+            for column in ('name', 'cost', 'co2', 'delivery_time', 'ethical_score')
+        )))
+        # One statement per chunk instead of one per row. Every full chunk
+        # produces the same SQL text, so it is prepared only once. RETURNING
+        # rows come back in no particular order, so map them by name.
+        ids = {}
+        for start in range(0, len(rows), MULTI_ROW_INSERT_CHUNK):
+            chunk = rows[start:start + MULTI_ROW_INSERT_CHUNK]
+            placeholders = ', '.join(['(?, ?, ?, ?, ?)'] * len(chunk))
+            cursor.execute(
+                UPSERT_SUPPLIERS_PREFIX + placeholders + UPSERT_SUPPLIERS_SUFFIX,
+                [value for row in chunk for value in row]
+            )
+            ids.update(cursor.fetchall())
+        
+        return [ids[row[0]] for row in rows]
+    
     def save_suppliers(self, suppliers_df):
-        """Save suppliers to the database.
+        """Save suppliers to the database, updating suppliers that already exist.
         
         Args:
             suppliers_df (pandas.DataFrame): DataFrame containing supplier data.
@@ -132,58 +543,93 @@ class Database:
         Returns:
             list: List of supplier IDs.
         """
-        logger.info(f"Saving {len(suppliers_df)} suppliers")
+        logger.info("Saving %d suppliers", len(suppliers_df))
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        supplier_ids = []
+        with self._writer() as (conn, cursor):
+            try:
+                # Start transaction, taking the write lock up front
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                supplier_ids = self._save_suppliers(cursor, suppliers_df)
+                
+                # Commit transaction
+                conn.commit()
+                logger.info("Successfully saved %d suppliers", len(supplier_ids))
+                return supplier_ids
+            except Exception as e:
+                # Rollback transaction on error
+                conn.rollback()
+                logger.error(f"Error saving suppliers: {e}")
+                raise e
+    
+    def _fetch_rows(self, query, params=(), snapshot=False):
+        """Run a query and return its raw result.
         
-        try:
-            # Start transaction
-            cursor.execute("BEGIN")
+        Args:
+            query (str): SQL query to run.
+            params (tuple, optional): Query parameters. Defaults to ().
+            snapshot (bool, optional): Read from the in-memory snapshot when
+                one is enabled. Defaults to False.
             
-            for _, row in suppliers_df.iterrows():
-                cursor.execute('''
-                    INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    row['name'],
-                    row['cost'],
-                    row['co2'],
-                    row['delivery_time'],
-                    row['ethical_score']
-                ))
-                supplier_ids.append(cursor.lastrowid)
+        Returns:
+            tuple: List of row tuples and list of column names.
+        """
+        if snapshot and self._snapshot is not None:
+            with self._snapshot_lock:
+                cursor = self._snapshot.execute(query, params)
+                rows = cursor.fetchall()
+                names = [d[0] for d in cursor.description]
+                cursor.close()
+            return rows, names
+        
+        with self._reader() as (conn, cursor):
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            names = [d[0] for d in cursor.description]
+        return rows, names
+    
+    def _fetch_columns(self, query, params=(), snapshot=False):
+        """Run a query and return its result as one NumPy array per column.
+        
+        Args:
+            query (str): SQL query to run.
+            params (tuple, optional): Query parameters. Defaults to ().
+            snapshot (bool, optional): Read from the in-memory snapshot when
+                one is enabled. Defaults to False.
             
-            # Commit transaction
-            conn.commit()
-            logger.info(f"Successfully saved {len(supplier_ids)} suppliers")
-            return supplier_ids
-        except Exception as e:
-            # Rollback transaction on error
-            conn.rollback()
-            logger.error(f"Error saving suppliers: {e}")
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+        Returns:
+            dict: Mapping of column name to numpy.ndarray.
+        """
+        rows, names = self._fetch_rows(query, params, snapshot)
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: np.asarray(col) for name, col in zip(names, columns)}
+    
+    def _read(self, query, params=(), as_arrays=False, snapshot=False):
+        """Run a read query as a DataFrame, or as NumPy arrays if requested.
+        
+        The DataFrame is built from the fetched tuples with from_records,
+        which skips the per-column conversion done by read_sql_query.
+        """
+        if as_arrays:
+            return self._fetch_columns(query, params, snapshot)
+        rows, names = self._fetch_rows(query, params, snapshot)
+        return pd.DataFrame.from_records(rows, columns=names)
     
-    def get_suppliers(self):
+    def get_suppliers(self, as_arrays=False):
         """Get all suppliers from the database.
         
+        Args:
+            as_arrays (bool, optional): Return a dict of NumPy arrays keyed by
+                column instead of a DataFrame. Defaults to False.
+            
         Returns:
-            pandas.DataFrame: DataFrame containing supplier data.
+            pandas.DataFrame or dict: DataFrame (or column arrays) containing supplier data.
         """
         logger.info("Fetching all suppliers")
         
-        conn = self._get_connection()
-        try:
-            query = "SELECT id, name, cost, co2, delivery_time, ethical_score FROM suppliers"
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} suppliers")
-            return df
-        finally:
-            conn.close()
+        data = self._read(SUPPLIERS_QUERY, as_arrays=as_arrays)
+        logger.info("Retrieved %d suppliers", len(data['id']))
+        return data
     
     def save_optimization(self, suppliers_df, description=None):
         """Save an optimization run to the database.
@@ -195,58 +641,81 @@ class Database:
         Returns:
             int: ID of the optimization.
         """
-        logger.info(f"Saving optimization with {len(suppliers_df)} suppliers")
-        
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        logger.info("Saving optimization with %d suppliers", len(suppliers_df))
+        return self.save_optimizations([suppliers_df], [description])[0]
+    
+    def save_optimizations(self, suppliers_dfs, descriptions=None):
+        """Save several optimization runs in a single transaction.
         
-        try:
-            # Start transaction
-            cursor.execute("BEGIN")
-            
-            # Get current timestamp
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Insert optimization
-            cursor.execute('''
-                INSERT INTO optimizations (timestamp, description, num_suppliers)
-                VALUES (?, ?, ?)
-            ''', (
-                timestamp,
-                description or f"Optimization run at {timestamp}",
-                len(suppliers_df)
-            ))
-            
-            optimization_id = cursor.lastrowid
-            logger.debug(f"Created optimization with ID {optimization_id}")
-            
-            # Save supplier IDs if they don't exist
-            supplier_ids = self.save_suppliers(suppliers_df[['name', 'cost', 'co2', 'delivery_time', 'ethical_score']])
-            
-            # Insert optimization results
-            for i, (_, row) in enumerate(suppliers_df.iterrows()):
-                cursor.execute('''
-                    INSERT INTO optimization_results (optimization_id, supplier_id, score, selected)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    optimization_id,
-                    supplier_ids[i],
-                    row['predicted_score'],
-                    1 if i < 3 else 0  # Select top 3 suppliers
-                ))
+        Args:
+            suppliers_dfs (list): DataFrames containing supplier data with scores,
+                one per optimization run.
+            descriptions (list, optional): Description for each run. Defaults to None.
             
-            # Commit transaction
-            conn.commit()
-            logger.info(f"Successfully saved optimization {optimization_id}")
-            return optimization_id
-        except Exception as e:
-            # Rollback transaction on error
-            conn.rollback()
-            logger.error(f"Error saving optimization: {e}")
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+        Returns:
+            list: IDs of the optimizations, in input order.
+        """
+        if descriptions is None:
+            descriptions = [None] * len(suppliers_dfs)
+        
+        with self._writer() as (conn, cursor):
+            try:
+                # Start transaction, taking the write lock up front
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                # Get current timestamp once and reuse it for the default descriptions
+                timestamp = time.time_ns() // 1000
+                default_description = "Optimization run at " + time.strftime(
+                    TIMESTAMP_FORMAT, time.localtime(timestamp / 1000000)
+                )
+                
+                optimization_ids = []
+                results_rows = []
+                for suppliers_df, description in zip(suppliers_dfs, descriptions):
+                    # Insert optimization
+                    cursor.execute(INSERT_OPTIMIZATION, (
+                        timestamp,
+                        description or default_description,
+                        len(suppliers_df)
+                    ))
+                    
+                    optimization_id = cursor.lastrowid
+                    optimization_ids.append(optimization_id)
+                    logger.debug("Created optimization with ID %d", optimization_id)
+                    
+                    # Save suppliers in the same transaction as the optimization
+                    supplier_ids = self._save_suppliers(cursor, suppliers_df)
+                    
+                    # Select the top 3 suppliers by score, regardless of input order
+                    scores = suppliers_df['predicted_score'].to_numpy()
+                    n = len(scores)
+                    selected = np.zeros(n, dtype=np.int64)
+                    if n > 3:
+                        selected[np.argpartition(-scores, 2)[:3]] = 1
+                    else:
+                        selected[:] = 1
+                    
+                    results_rows.extend(zip(
+                        [optimization_id] * n,
+                        supplier_ids,
+                        scores.tolist(),
+                        selected.tolist(),
+                        *(suppliers_df[column].to_numpy().tolist()
+                          for column in ('cost', 'co2', 'delivery_time', 'ethical_score'))
+                    ))
+                
+                # Insert optimization results for every run at once
+                cursor.executemany(INSERT_RESULT, results_rows)
+                
+                # Commit transaction
+                conn.commit()
+                logger.info("Successfully saved optimizations %s", optimization_ids)
+                return optimization_ids
+            except Exception as e:
+                # Rollback transaction on error
+                conn.rollback()
+                logger.error(f"Error saving optimization: {e}")
+                raise e
     
     def get_optimizations(self, limit=10):
         """Get recent optimizations from the database.
@@ -257,120 +726,181 @@ class Database:
         Returns:
             pandas.DataFrame: DataFrame containing optimization data.
         """
-        logger.info(f"Fetching {limit} recent optimizations")
+        logger.info("Fetching %s recent optimizations", limit)
         
-        conn = self._get_connection()
-        try:
-            query = f"""
-                SELECT id, timestamp, description, num_suppliers 
-                FROM optimizations 
-                ORDER BY timestamp DESC 
-                LIMIT {limit}
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} optimizations")
-            return df
-        finally:
-            conn.close()
+        df = self._read(OPTIMIZATIONS_QUERY, (int(limit),), snapshot=True)
+        logger.info("Retrieved %d optimizations", len(df))
+        return df
     
-    def get_optimization_results(self, optimization_id):
+    def get_optimization_results(self, optimization_id, as_arrays=False):
         """Get results for a specific optimization.
         
         Args:
             optimization_id (int): ID of the optimization.
+            as_arrays (bool, optional): Return a dict of NumPy arrays keyed by
+                column instead of a DataFrame. Defaults to False.
             
         Returns:
-            pandas.DataFrame: DataFrame containing optimization results.
+            pandas.DataFrame or dict: DataFrame (or column arrays) containing optimization results.
         """
-        logger.info(f"Fetching results for optimization {optimization_id}")
+        logger.info("Fetching results for optimization %s", optimization_id)
         
-        conn = self._get_connection()
-        try:
-            query = f"""
-                SELECT s.name, s.cost, s.co2, s.delivery_time, s.ethical_score, r.score as predicted_score, r.selected
-                FROM optimization_results r
-                JOIN suppliers s ON r.supplier_id = s.id
-                WHERE r.optimization_id = {optimization_id}
-                ORDER BY r.score DESC
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} results")
-            return df
-        finally:
-            conn.close()
+        data = self._read(OPTIMIZATION_RESULTS_QUERY, (int(optimization_id),), as_arrays)
+        logger.info("Retrieved %d results", len(data['name']))
+        return data
     
-    def get_optimization_trends(self, limit=7):
+    def get_optimization_trends(self, limit=7, as_arrays=False):
         """Get optimization trends for the last N optimizations.
         
         Args:
             limit (int, optional): Maximum number of optimizations to include. Defaults to 7.
+            as_arrays (bool, optional): Return a dict of NumPy arrays keyed by
+                column instead of a DataFrame. Defaults to False.
             
         Returns:
-            pandas.DataFrame: DataFrame containing trend data.
+            pandas.DataFrame or dict: DataFrame (or column arrays) containing trend data.
+        """
+        logger.info("Fetching optimization trends for last %s optimizations", limit)
+        
+        data = self._read(OPTIMIZATION_TRENDS_QUERY, (int(limit),), as_arrays, snapshot=True)
+        
+        logger.info("Retrieved trends for %d optimizations", len(data['timestamp']))
+        return data
+    
+    def _start_activity_writer(self):
+        """Start the background thread that writes queued activities."""
+        self._activity_queue = Queue(maxsize=ACTIVITY_QUEUE_SIZE)
+        self._activity_thread = threading.Thread(
+            target=self._activity_flusher,
+            name='EthicSupply-activity-writer',
+            daemon=True
+        )
+        self._activity_thread.start()
+    
+    def _stop_activity_writer(self):
+        """Write any queued activities and stop the background writer."""
+        if self._activity_thread.is_alive():
+            self._activity_queue.put(_STOP)
+            self._activity_thread.join(timeout=10.0)
+        if not self._activity_thread.is_alive():
+            self._drain_activity_queue()
+    
+    def _drain_activity_queue(self):
+        """Write activities queued after the writer exited.
+        
+        log_activity can enqueue between its liveness check and the writer
+        taking its stop marker; writing those rows here keeps task_done()
+        balanced so waiting readers are not left hanging.
         """
-        logger.info(f"Fetching optimization trends for last {limit} optimizations")
+        batch = []
+        while True:
+            try:
+                batch.append(self._activity_queue.get_nowait())
+            except Empty:
+                break
         
-        conn = self._get_connection()
+        rows = [item for item in batch if item is not _STOP]
         try:
-            query = f"""
-                SELECT o.timestamp, 
-                       AVG(CASE WHEN r.selected = 1 THEN s.cost ELSE NULL END) as avg_cost,
-                       AVG(CASE WHEN r.selected = 1 THEN s.co2 ELSE NULL END) as avg_co2,
-                       AVG(CASE WHEN r.selected = 1 THEN s.delivery_time ELSE NULL END) as avg_delivery,
-                       AVG(CASE WHEN r.selected = 1 THEN s.ethical_score ELSE NULL END) as avg_ethical
-                FROM optimizations o
-                JOIN optimization_results r ON o.id = r.optimization_id
-                JOIN suppliers s ON r.supplier_id = s.id
-                GROUP BY o.id
-                ORDER BY o.timestamp DESC
-                LIMIT {limit}
-            """
-            df = pd.read_sql_query(query, conn)
+            if rows:
+                self._insert_activities(rows)
+        except Exception:
+            # Already logged by _insert_activities
+            pass
+        finally:
+            for _ in batch:
+                self._activity_queue.task_done()
+    
+    def _wait_for_activities(self, timeout):
+        """Wait until the activity queue is drained or the timeout expires.
+        
+        Args:
+            timeout (float): Maximum number of seconds to wait.
             
-            # Reverse the order to have chronological order
-            if not df.empty:
-                df = df.iloc[::-1].reset_index(drop=True)
+        Returns:
+            bool: True if no activities were left unwritten.
+        """
+        queue = self._activity_queue
+        with queue.all_tasks_done:
+            if not self._activity_thread.is_alive():
+                return queue.unfinished_tasks == 0
+            return queue.all_tasks_done.wait_for(
+                lambda: queue.unfinished_tasks == 0, timeout=timeout
+            )
+    
+    def _activity_flusher(self):
+        """Drain the activity queue, committing each batch in one transaction."""
+        while True:
+            batch = [self._activity_queue.get()]
+            while len(batch) < ACTIVITY_BATCH_SIZE:
+                try:
+                    batch.append(self._activity_queue.get_nowait())
+                except Empty:
+                    break
             
-            logger.info(f"Retrieved trends for {len(df)} optimizations")
-            return df
-        finally:
-            conn.close()
+            rows = [item for item in batch if item is not _STOP]
+            try:
+                if rows:
+                    self._insert_activities(rows)
+            except Exception:
+                # Already logged by _insert_activities; keep the writer alive
+                pass
+            finally:
+                for _ in batch:
+                    self._activity_queue.task_done()
+            
+            if len(rows) < len(batch):
+                return
     
-    def log_activity(self, activity_type, description, details=None):
+    def _insert_activities(self, rows):
+        """Insert activity rows in a single transaction.
+        
+        Args:
+            rows (list): (timestamp, activity_type, description, details) tuples.
+        """
+        with self._writer() as (conn, cursor):
+            try:
+                # Start transaction, taking the write lock up front
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                cursor.executemany(INSERT_ACTIVITY, rows)
+                
+                # Commit transaction
+                conn.commit()
+                logger.debug("Wrote %d activities", len(rows))
+            except Exception as e:
+                # Rollback transaction on error
+                conn.rollback()
+                logger.error(f"Error logging activity: {e}")
+                raise e
+    
+    def log_activity(self, activity_type, description, details=None, sync=False):
         """Log an activity to the database.
         
+        Activities are queued and committed in batches by a background thread.
+        
         Args:
             activity_type (str): Type of activity (e.g., 'input', 'optimize', 'export').
             description (str): Description of the activity.
             details (str, optional): Additional details about the activity.
+            sync (bool, optional): Write the activity before returning instead of
+                queueing it. Defaults to False.
         """
-        logger.info(f"Logging activity: {activity_type} - {description}")
+        logger.info("Logging activity: %s - %s", activity_type, description)
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        row = (time.time_ns() // 1000, activity_type, description, details)
         
-        try:
-            # Start transaction
-            cursor.execute("BEGIN")
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            cursor.execute('''
-                INSERT INTO activities (timestamp, activity_type, description, details)
-                VALUES (?, ?, ?, ?)
-            ''', (timestamp, activity_type, description, details))
-            
-            # Commit transaction
-            conn.commit()
-            logger.info("Activity logged successfully")
-        except Exception as e:
-            # Rollback transaction on error
-            conn.rollback()
-            logger.error(f"Error logging activity: {e}")
-            raise e
-        finally:
-            cursor.close()
-            conn.close()
+        if not sync and self._activity_thread.is_alive():
+            try:
+                self._activity_queue.put_nowait(row)
+                # The writer may have stopped after the check above
+                if not self._activity_thread.is_alive():
+                    self._drain_activity_queue()
+                return
+            except Full:
+                logger.warning("Activity queue is full, writing synchronously")
+        
+        self._insert_activities([row])
+        logger.info("Activity logged successfully")
     
     def get_recent_activities(self, limit=10):
         """Get recent activities from the database.
@@ -381,43 +911,55 @@ class Database:
         Returns:
             pandas.DataFrame: DataFrame containing activity data.
         """
-        logger.info(f"Fetching {limit} recent activities")
+        logger.info("Fetching %s recent activities", limit)
         
-        conn = self._get_connection()
-        try:
-            query = f"""
-                SELECT id, timestamp, activity_type, description, details
-                FROM activities
-                ORDER BY timestamp DESC
-                LIMIT {limit}
-            """
-            df = pd.read_sql_query(query, conn)
-            logger.info(f"Retrieved {len(df)} activities")
-            return df
-        finally:
-            conn.close()
+        # Give queued activities a moment to be written so callers usually
+        # see their own writes, unless reads come from the snapshot, which
+        # lags behind anyway
+        if self._snapshot is None:
+            self._wait_for_activities(ACTIVITY_READ_WAIT)
+        
+        df = self._read(RECENT_ACTIVITIES_QUERY, (int(limit),), snapshot=True)
+        logger.info("Retrieved %d activities", len(df))
+        return df
+
+@functools.lru_cache(maxsize=None)
+def _database_for(db_path, snapshot_interval):
+    """Create the Database for a resolved path; cached so it happens once."""
+    return Database(db_path, snapshot_interval)
+
+
+def get_database(db_path='ethicsupply_new.db', snapshot_interval=None):
+    """Get the shared Database instance for a database file.
+    
+    Args:
+        db_path (str, optional): Path to the database file. 
+            Defaults to 'ethicsupply_new.db'.
+        snapshot_interval (float, optional): See Database. Defaults to None.
+        
+    Returns:
+        Database: The instance for that file, created on first use.
+    """
+    # Resolve the path first so equivalent arguments share one cache entry
+    return _database_for(os.path.join(os.path.dirname(__file__), db_path), snapshot_interval)
 
 if __name__ == "__main__":
     # Test the database functionality
-    import numpy as np
     
     # Generate sample data
-    suppliers = []
-    for i in range(1, 16):
-        supplier = {
-            'name': f"Supplier_{i:04d}",
-            'cost': np.random.uniform(100, 1000),
-            'co2': np.random.uniform(100, 500),
-            'delivery_time': np.random.uniform(1, 30),
-            'ethical_score': np.random.uniform(0, 100),
-            'predicted_score': np.random.uniform(0, 100)
-        }
-        suppliers.append(supplier)
-    
-    df = pd.DataFrame(suppliers)
+    n = 15
+    rng = np.random.default_rng()
+    df = pd.DataFrame({
+        'name': [f"Supplier_{i:04d}" for i in range(1, n + 1)],
+        'cost': rng.uniform(100, 1000, n),
+        'co2': rng.uniform(100, 500, n),
+        'delivery_time': rng.uniform(1, 30, n),
+        'ethical_score': rng.uniform(0, 100, n),
+        'predicted_score': rng.uniform(0, 100, n)
+    })
     
     # Initialize database
-    db = Database()
+    db = get_database()
     
     # Save optimization
     optimization_id = db.save_optimization(df, "Test optimization")
@@ -2,13 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import atexit
+import functools
+import itertools
 import sqlite3
 import pandas as pd
 from datetime import datetime
 import threading
 import time
 import logging
-from queue import Queue
+import weakref
+from queue import Queue, Empty, Full
 from contextlib import contextmanager
 import numpy as np
 
@@ -19,8 +24,166 @@ logging.basicConfig(
 )
 logger = logging.getLogger('EthicSupply.Database')
 
+# Rows per multi-row INSERT statement, capped so one statement never binds
+# more than SQLite's default limit of 999 host parameters
+MULTI_ROW_INSERT_ROWS = 200
+SQLITE_MAX_VARIABLES = 999
+
+# Number of top-ranked suppliers selected by an optimization run
+SELECTED_SUPPLIERS = 3
+
+# Weights of normalized cost, CO2 and delivery time in the ethical score (0-100)
+ETHICAL_SCORE_WEIGHTS = np.array([30.0, 40.0, 30.0])
+
+# Checkpoint the WAL passively every CHECKPOINT_EVERY saved optimizations, and
+# truncate it after a save of more than CHECKPOINT_TRUNCATE_ROWS suppliers or
+# once the WAL file grows past WAL_TRUNCATE_BYTES
+CHECKPOINT_EVERY = 50
+CHECKPOINT_TRUNCATE_ROWS = 10000
+WAL_TRUNCATE_BYTES = 64 * 1024 * 1024
+
+# Activities are queued and written by a background thread in batches of at
+# most ACTIVITY_BATCH_SIZE rows, gathered for up to ACTIVITY_FLUSH_INTERVAL seconds
+ACTIVITY_QUEUE_SIZE = 1024
+ACTIVITY_BATCH_SIZE = 64
+ACTIVITY_FLUSH_INTERVAL = 0.1
+
+# Longest a read of recent activities waits for queued ones to be written
+ACTIVITY_READ_WAIT = 0.5
+
+# Queue marker that tells the activity writer to exit
+_STOP = object()
+
+# Run PRAGMA optimize on a connection every this many returns to the pool
+OPTIMIZE_EVERY = 100
+
+def _multi_insert(conn, sql_prefix, cols_per_row, rows, max_rows_per_stmt=MULTI_ROW_INSERT_ROWS):
+    """Insert rows with as few multi-row ``INSERT ... VALUES`` statements as possible.
+    
+    Args:
+        conn (sqlite3.Connection): Connection inside the caller's transaction.
+        sql_prefix (str): Statement up to, but not including, ``VALUES``.
+        cols_per_row (int): Number of values in each row.
+        rows (iterable): Row tuples to insert. Consumed one statement's worth
+            at a time, so iterators are never materialised in full.
+        max_rows_per_stmt (int, optional): Maximum rows per statement.
+    """
+    chunk_size = max(1, min(max_rows_per_stmt, SQLITE_MAX_VARIABLES // cols_per_row))
+    row_placeholder = "(" + ", ".join(["?"] * cols_per_row) + ")"
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        placeholders = ", ".join([row_placeholder] * len(chunk))
+        conn.execute(f"{sql_prefix} VALUES {placeholders}", [value for row in chunk for value in row])
+
+# Version of the schema below, stored in PRAGMA user_version. Version 1 stores
+# timestamps as INTEGER Unix epoch seconds instead of TEXT.
+SCHEMA_VERSION = 1
+
+# Converts a legacy TEXT timestamp column to epoch seconds. Older rows hold
+# local "%Y-%m-%d %H:%M:%S" strings; save_optimization wrote epoch seconds,
+# which TEXT affinity stored as digit strings.
+TEXT_TO_EPOCH = """CASE
+    WHEN timestamp GLOB '*-*' THEN COALESCE(CAST(strftime('%s', timestamp, 'utc') AS INTEGER), 0)
+    ELSE CAST(timestamp AS INTEGER)
+END"""
+
+# Tables and indexes created by Database._setup_database. The indexes serve
+# the ORDER BY timestamp DESC LIMIT ? reads and the per-optimization results
+# lookup.
+_DDL = """
+CREATE TABLE IF NOT EXISTS suppliers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    cost REAL NOT NULL,
+    co2 REAL NOT NULL,
+    delivery_time REAL NOT NULL,
+    ethical_score REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS optimizations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    description TEXT,
+    num_suppliers INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS optimization_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    optimization_id INTEGER NOT NULL,
+    supplier_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    selected INTEGER NOT NULL,
+    FOREIGN KEY (optimization_id) REFERENCES optimizations (id),
+    FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
+);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    activity_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    details TEXT
+);
+
+CREATE TABLE IF NOT EXISTS optimization_trends (
+    optimization_id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    avg_cost REAL,
+    avg_co2 REAL,
+    avg_delivery REAL,
+    avg_ethical REAL,
+    FOREIGN KEY (optimization_id) REFERENCES optimizations (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_opt_ts ON optimizations (timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_res_opt ON optimization_results (optimization_id, score DESC);
+CREATE INDEX IF NOT EXISTS idx_act_ts ON activities (timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_trends_ts ON optimization_trends (timestamp DESC);
+"""
+
+def _connect(db_path):
+    """Open a connection to the database with the pool's settings.
+    
+    Args:
+        db_path (str): Path to the database file.
+        
+    Returns:
+        sqlite3.Connection: The configured connection.
+    """
+    # Connections are handed to one borrower at a time, so they can
+    # safely move between the GUI thread and worker threads
+    conn = sqlite3.connect(db_path, timeout=120.0, check_same_thread=False)
+    # Enable WAL mode for better concurrency
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA busy_timeout=120000")
+    # Keep hot pages and temp tables in memory
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
+    return conn
+
+class _ConnectionLease:
+    """A pooled connection pinned to the thread that first borrowed it."""
+    
+    __slots__ = ('conn', 'depth', '__weakref__')
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 0
+
 class ConnectionPool:
-    """A simple connection pool for SQLite databases."""
+    """A simple connection pool for SQLite databases.
+    
+    A thread keeps the connection it first borrows and gets it back on every
+    later request without touching the shared queue. The connection returns
+    to the queue when the thread exits.
+    """
     
     def __init__(self, db_path, max_connections=5):
         """Initialize the connection pool.
@@ -33,17 +196,14 @@ class ConnectionPool:
         self.max_connections = max_connections
         self.connections = Queue(maxsize=max_connections)
         self.lock = threading.Lock()
+        self._returns = 0
+        self._tls = threading.local()
+        self._all_connections = []
         
         # Initialize the pool with connections
         for _ in range(max_connections):
-            conn = sqlite3.connect(db_path, timeout=120.0)
-            cursor = conn.cursor()
-            # Enable WAL mode for better concurrency
-            cursor.execute("PRAGMA journal_mode=WAL")
-            cursor.execute("PRAGMA synchronous=NORMAL")
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.execute("PRAGMA busy_timeout=120000")
-            cursor.close()
+            conn = _connect(db_path)
+            self._all_connections.append(conn)
             self.connections.put(conn)
     
     @contextmanager
@@ -53,44 +213,62 @@ class ConnectionPool:
         Yields:
             sqlite3.Connection: A database connection.
         """
-        conn = None
-        try:
+        lease = getattr(self._tls, 'lease', None)
+        if lease is None:
             conn = self.connections.get(timeout=60.0)
-            yield conn
+            lease = self._tls.lease = _ConnectionLease(conn)
+            # The thread-local lease is dropped when the thread exits, which
+            # hands the connection back to the queue
+            weakref.finalize(lease, self.connections.put, conn)
+        
+        lease.depth += 1
+        try:
+            yield lease.conn
         finally:
-            if conn:
-                self.connections.put(conn)
+            lease.depth -= 1
+            if lease.depth == 0:
+                with self.lock:
+                    self._returns += 1
+                    run_optimize = self._returns % OPTIMIZE_EVERY == 0
+                if run_optimize and not lease.conn.in_transaction:
+                    try:
+                        lease.conn.execute("PRAGMA optimize")
+                    except sqlite3.Error as e:
+                        logger.warning(f"PRAGMA optimize failed: {e}")
     
     def close_all(self):
         """Close all connections in the pool."""
         while not self.connections.empty():
-            conn = self.connections.get()
+            self.connections.get()
+        for conn in self._all_connections:
             conn.close()
+        self._all_connections.clear()
 
 class Database:
     """SQLite database for storing supplier data and optimization history."""
     
-    _instance = None
+    # Guards the WAL checkpoint counter shared by all instances
     _lock = threading.Lock()
     
-    def __new__(cls, db_path='ethicsupply_wal.db'):
-        """Singleton pattern to ensure only one database instance exists."""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(Database, cls).__new__(cls)
-                cls._instance.db_path = os.path.join(os.path.dirname(__file__), db_path)
-                cls._instance.connection_pool = ConnectionPool(cls._instance.db_path)
-                cls._instance._setup_database()
-            return cls._instance
+    # Optimizations saved since the WAL was last checkpointed
+    _commits_since_checkpoint = 0
+    
+    # Optional optimizations columns, in the order they are bound
+    _OPTIONAL_OPT_COLUMNS = ('method', 'num_suppliers', 'score')
     
     def __init__(self, db_path='ethicsupply_wal.db'):
         """Initialize the database.
         
+        Use get_database() to share one instance per database file.
+        
         Args:
             db_path (str, optional): Path to the database file. 
                 Defaults to 'ethicsupply_wal.db'.
         """
-        pass  # Initialization is done in __new__
+        self.db_path = os.path.join(os.path.dirname(__file__), db_path)
+        self.connection_pool = ConnectionPool(self.db_path)
+        self._setup_database()
+        self._start_activity_writer()
     
     def _setup_database(self):
         """Set up the database and create tables."""
@@ -99,62 +277,108 @@ class Database:
         
         # Create tables
         with self.connection_pool.get_connection() as conn:
-            cursor = conn.cursor()
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._migrate_text_timestamps(conn)
             
-            try:
-                # Enable foreign keys
-                cursor.execute("PRAGMA foreign_keys=ON")
-                
-                # Create suppliers table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS suppliers (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        cost REAL NOT NULL,
-                        co2 REAL NOT NULL,
-                        delivery_time REAL NOT NULL,
-                        ethical_score REAL NOT NULL
-                    )
-                ''')
-                
-                # Create optimizations table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS optimizations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        description TEXT,
-                        num_suppliers INTEGER NOT NULL
-                    )
-                ''')
-                
-                # Create optimization_results table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS optimization_results (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        optimization_id INTEGER NOT NULL,
-                        supplier_id INTEGER NOT NULL,
-                        score REAL NOT NULL,
-                        selected INTEGER NOT NULL,
-                        FOREIGN KEY (optimization_id) REFERENCES optimizations (id),
-                        FOREIGN KEY (supplier_id) REFERENCES suppliers (id)
-                    )
-                ''')
-                
-                # Create activities table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS activities (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        activity_type TEXT NOT NULL,
-                        description TEXT NOT NULL,
-                        details TEXT
-                    )
+            # optimization_trends holds one row of selected-supplier averages
+            # per optimization, written when the run is saved; it is
+            # backfilled below when this call creates it
+            trends_exist = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='optimization_trends'"
+            ).fetchone() is not None
+            
+            # Create all tables and indexes in one script, leaving its
+            # transaction open so the backfill commits together with it
+            conn.executescript(
+                f"PRAGMA foreign_keys=ON; BEGIN; {_DDL} PRAGMA user_version={SCHEMA_VERSION};"
+            )
+            
+            if not trends_exist:
+                # Backfill the trends of optimizations saved before the table existed
+                conn.execute('''
+                    INSERT INTO optimization_trends
+                    SELECT o.id, o.timestamp,
+                           AVG(CASE WHEN r.selected = 1 THEN s.cost ELSE NULL END),
+                           AVG(CASE WHEN r.selected = 1 THEN s.co2 ELSE NULL END),
+                           AVG(CASE WHEN r.selected = 1 THEN s.delivery_time ELSE NULL END),
+                           AVG(CASE WHEN r.selected = 1 THEN s.ethical_score ELSE NULL END)
+                    FROM optimizations o
+                    JOIN optimization_results r ON o.id = r.optimization_id
+                    JOIN suppliers s ON r.supplier_id = s.id
+                    GROUP BY o.id
                 ''')
+            
+            conn.commit()
+            
+            # The schema is fixed from here on, so build the INSERTs used
+            # by save_optimization once instead of inspecting it per call
+            self._opt_cols = frozenset(info[1] for info in conn.execute("PRAGMA table_info(optimizations)"))
+            self._opt_insert_fields = ('timestamp', 'description') + tuple(
+                col for col in self._OPTIONAL_OPT_COLUMNS if col in self._opt_cols
+            )
+            self._opt_insert_sql = (
+                f"INSERT INTO optimizations ({', '.join(self._opt_insert_fields)}) "
+                f"VALUES ({', '.join('?' * len(self._opt_insert_fields))})"
+            )
+            
+            # Older databases key suppliers on the optimization that saved them
+            supplier_cols = frozenset(info[1] for info in conn.execute("PRAGMA table_info(suppliers)"))
+            self._supplier_insert_fields = (
+                ('optimization_id',) if 'optimization_id' in supplier_cols else ()
+            ) + ('name', 'cost', 'co2', 'delivery_time', 'ethical_score')
+            self._supplier_insert_sql = (
+                f"INSERT INTO suppliers ({', '.join(self._supplier_insert_fields)})"
+            )
+            logger.info("Database tables created successfully")
+    
+    def _migrate_text_timestamps(self, conn):
+        """Rebuild tables that still declare timestamp TEXT to store INTEGER epoch seconds.
+        
+        SQLite cannot change a column's type in place, so each table is
+        renamed, recreated from its original definition with the new type,
+        refilled with converted timestamps and the old copy dropped.
+        
+        Args:
+            conn (sqlite3.Connection): Connection used for the setup.
+        """
+        tables = []
+        for table in ('optimizations', 'activities', 'optimization_trends'):
+            columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            if any(info[1] == 'timestamp' and info[2].upper() == 'TEXT' for info in columns):
+                tables.append((table, [info[1] for info in columns]))
+        
+        if not tables:
+            return
+        
+        logger.info(f"Migrating timestamps to INTEGER in {[table for table, _ in tables]}")
+        
+        # Keep foreign keys that reference the renamed tables pointing at the
+        # original names, which the rebuilt tables take over
+        conn.executescript("PRAGMA foreign_keys=OFF; PRAGMA legacy_alter_table=ON; BEGIN;")
+        try:
+            for table, columns in tables:
+                original_sql = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+                ).fetchone()[0]
+                create_sql = re.sub(r'\btimestamp\s+TEXT\b', 'timestamp INTEGER', original_sql,
+                                    flags=re.IGNORECASE)
+                select_list = ', '.join(TEXT_TO_EPOCH if col == 'timestamp' else col for col in columns)
                 
-                conn.commit()
-                logger.info("Database tables created successfully")
-            finally:
-                cursor.close()
+                conn.execute(f"ALTER TABLE {table} RENAME TO _{table}_text")
+                conn.execute(create_sql)
+                conn.execute(f"""
+                    INSERT INTO {table} ({', '.join(columns)})
+                    SELECT {select_list} FROM _{table}_text
+                """)
+                conn.execute(f"DROP TABLE _{table}_text")
+            
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error migrating timestamps: {e}")
+            raise e
+        finally:
+            conn.executescript("PRAGMA legacy_alter_table=OFF; PRAGMA foreign_keys=ON;")
     
     def save_suppliers(self, suppliers_df):
         """Save suppliers to the database.
@@ -167,26 +391,30 @@ class Database:
         """
         logger.info(f"Saving {len(suppliers_df)} suppliers")
         
+        num_rows = len(suppliers_df)
+        rows = suppliers_df[['name', 'cost', 'co2', 'delivery_time', 'ethical_score']].itertuples(
+            index=False, name=None)
+        
         with self.connection_pool.get_connection() as conn:
-            cursor = conn.cursor()
             supplier_ids = []
             
             try:
                 # Start transaction
-                cursor.execute("BEGIN")
+                conn.execute("BEGIN")
                 
-                for _, row in suppliers_df.iterrows():
-                    cursor.execute('''
-                        INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        row['name'],
-                        row['cost'],
-                        row['co2'],
-                        row['delivery_time'],
-                        row['ethical_score']
-                    ))
-                    supplier_ids.append(cursor.lastrowid)
+                if num_rows:
+                    _multi_insert(
+                        conn,
+                        "INSERT INTO suppliers (name, cost, co2, delivery_time, ethical_score)",
+                        5,
+                        rows
+                    )
+                    
+                    # The open transaction holds the write lock for the whole
+                    # batch, so the AUTOINCREMENT IDs are contiguous and end
+                    # at last_id.
+                    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    supplier_ids = list(range(last_id - num_rows + 1, last_id + 1))
                 
                 # Commit transaction
                 conn.commit()
@@ -197,8 +425,22 @@ class Database:
                 conn.rollback()
                 logger.error(f"Error saving suppliers: {e}")
                 raise e
-            finally:
-                cursor.close()
+    
+    @staticmethod
+    def _read_frame(conn, query, params=()):
+        """Run a query and build a DataFrame directly from its rows.
+        
+        Args:
+            conn (sqlite3.Connection): A pooled connection.
+            query (str): SQL query to run.
+            params (tuple, optional): Values bound to the query's placeholders.
+            
+        Returns:
+            pandas.DataFrame: Query results, one column per selected field.
+        """
+        cursor = conn.execute(query, params)
+        columns = [desc[0] for desc in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
     
     def get_suppliers(self):
         """Get all suppliers from the database.
@@ -211,7 +453,7 @@ class Database:
         with self.connection_pool.get_connection() as conn:
             try:
                 query = "SELECT id, name, cost, co2, delivery_time, ethical_score FROM suppliers"
-                df = pd.read_sql_query(query, conn)
+                df = self._read_frame(conn, query)
                 logger.info(f"Retrieved {len(df)} suppliers")
                 return df
             except Exception as e:
@@ -229,172 +471,143 @@ class Database:
         Returns:
             int: Optimization ID
         """
-        conn = None
-        try:
-            # Create connection and cursor
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # First determine the schema of the optimizations table
-            cursor.execute("PRAGMA table_info(optimizations)")
-            columns = [info[1] for info in cursor.fetchall()]
-            
-            timestamp = int(time.time())
-            desc = description or f"Optimization run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            num_suppliers = len(suppliers_df)
-            
-            # Create optimization record based on schema
-            optimization_id = None
-            
-            # Check if table exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='optimizations'")
-            if not cursor.fetchone():
-                # Create the table with minimal schema
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS optimizations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp INTEGER NOT NULL,
-                        description TEXT
-                    )
-                ''')
-                cursor.execute('''
-                    INSERT INTO optimizations (timestamp, description)
-                    VALUES (?, ?)
-                ''', (timestamp, desc))
-                optimization_id = cursor.lastrowid
-            else:
-                # Table exists, determine schema
-                cols = set(columns)
+        with self.connection_pool.get_connection() as conn:
+            try:
+                # Take the write lock up front so the whole save is one transaction
+                conn.execute("BEGIN IMMEDIATE")
                 
-                # Different combinations of columns
-                if 'method' in cols and 'num_suppliers' in cols and 'score' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, method, num_suppliers, score)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (timestamp, desc, method, num_suppliers, 0))
-                elif 'method' in cols and 'num_suppliers' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, method, num_suppliers)
-                        VALUES (?, ?, ?, ?)
-                    ''', (timestamp, desc, method, num_suppliers))
-                elif 'method' in cols and 'score' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, method, score)
-                        VALUES (?, ?, ?, ?)
-                    ''', (timestamp, desc, method, 0))
-                elif 'num_suppliers' in cols and 'score' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, num_suppliers, score)
-                        VALUES (?, ?, ?, ?)
-                    ''', (timestamp, desc, num_suppliers, 0))
-                elif 'method' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, method)
-                        VALUES (?, ?, ?)
-                    ''', (timestamp, desc, method))
-                elif 'num_suppliers' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, num_suppliers)
-                        VALUES (?, ?, ?)
-                    ''', (timestamp, desc, num_suppliers))
-                elif 'score' in cols:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description, score)
-                        VALUES (?, ?, ?)
-                    ''', (timestamp, desc, 0))
-                else:
-                    cursor.execute('''
-                        INSERT INTO optimizations (timestamp, description)
-                        VALUES (?, ?)
-                    ''', (timestamp, desc))
+                timestamp = int(time.time())
+                desc = description or f"Optimization run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                num_suppliers = len(suppliers_df)
                 
-                optimization_id = cursor.lastrowid
-            
-            logging.debug(f"Created optimization with ID {optimization_id}")
-            
-            # Check if ethical_score exists, otherwise it will be calculated by the model
-            if 'ethical_score' not in suppliers_df.columns:
-                # Calculate normalized metrics for ethical score
-                normalized_df = suppliers_df.copy()
-                for col in ['cost', 'co2', 'delivery_time']:
-                    min_val = normalized_df[col].min()
-                    max_val = normalized_df[col].max()
-                    if max_val > min_val:
-                        normalized_df[col] = (normalized_df[col] - min_val) / (max_val - min_val)
-                    else:
-                        normalized_df[col] = 0.5
+                # Create optimization record based on schema
+                values = {
+                    'timestamp': timestamp,
+                    'description': desc,
+                    'method': method,
+                    'num_suppliers': num_suppliers,
+                    'score': 0
+                }
+                optimization_id = conn.execute(
+                    self._opt_insert_sql, tuple(values[field] for field in self._opt_insert_fields)
+                ).lastrowid
                 
-                # Invert cost, CO2, and delivery time (lower is better)
-                for col in ['cost', 'co2', 'delivery_time']:
-                    normalized_df[col] = 1 - normalized_df[col]
+                logging.debug(f"Created optimization with ID {optimization_id}")
                 
-                # Calculate ethical score
-                suppliers_df['ethical_score'] = (
-                    normalized_df['cost'] * 0.3 + 
-                    normalized_df['co2'] * 0.4 + 
-                    normalized_df['delivery_time'] * 0.3
-                ) * 100
-            
-            # Save suppliers to the database (create table if it doesn't exist)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS suppliers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    optimization_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    cost REAL NOT NULL,
-                    co2 REAL NOT NULL,
-                    delivery_time REAL NOT NULL,
-                    ethical_score REAL NOT NULL
+                # Check if ethical_score exists, otherwise it will be calculated by the model
+                if 'ethical_score' not in suppliers_df.columns:
+                    # Min-max normalize cost, CO2 and delivery time in place in
+                    # one scratch buffer
+                    metrics = np.ascontiguousarray(
+                        suppliers_df[['cost', 'co2', 'delivery_time']].to_numpy(dtype=np.float64))
+                    # An empty frame has nothing to normalize, and min/max
+                    # of zero rows would raise
+                    if num_suppliers:
+                        min_vals = metrics.min(axis=0)
+                        ranges = metrics.max(axis=0) - min_vals
+                        constant = ranges == 0
+                        ranges[constant] = 1.0
+                        np.subtract(metrics, min_vals, out=metrics)
+                        np.divide(metrics, ranges, out=metrics)
+                        
+                        # Invert cost, CO2, and delivery time (lower is better)
+                        np.subtract(1.0, metrics, out=metrics)
+                        metrics[:, constant] = 0.5
+                    
+                    # Calculate ethical score
+                    suppliers_df['ethical_score'] = metrics @ ETHICAL_SCORE_WEIGHTS
+                
+                # Save supplier data
+                logging.info(f"Saving {len(suppliers_df)} suppliers")
+                # Cast each column once; tolist() yields Python floats that
+                # sqlite3 binds without any per-value conversion
+                columns = [
+                    suppliers_df['name'].to_numpy(dtype=object),
+                    suppliers_df['cost'].to_numpy(dtype=np.float64).tolist(),
+                    suppliers_df['co2'].to_numpy(dtype=np.float64).tolist(),
+                    suppliers_df['delivery_time'].to_numpy(dtype=np.float64).tolist(),
+                    suppliers_df['ethical_score'].to_numpy(dtype=np.float64).tolist()
+                ]
+                if 'optimization_id' in self._supplier_insert_fields:
+                    columns.insert(0, itertools.repeat(optimization_id, num_suppliers))
+                records = zip(*columns)
+                _multi_insert(
+                    conn,
+                    self._supplier_insert_sql,
+                    len(self._supplier_insert_fields),
+                    records
                 )
-            ''')
-            
-            # Save supplier data
-            logging.info(f"Saving {len(suppliers_df)} suppliers")
-            for _, row in suppliers_df.iterrows():
-                cursor.execute('''
-                    INSERT INTO suppliers (
-                        optimization_id, name, cost, co2, delivery_time, ethical_score
+                
+                logging.info("Successfully saved suppliers")
+                
+                # Update score if applicable
+                if 'score' in self._opt_cols and len(suppliers_df) > 0:
+                    # Save the score of the top supplier
+                    try:
+                        top_supplier = suppliers_df.iloc[0]
+                        if 'predicted_score' in top_supplier:
+                            conn.execute('''
+                                UPDATE optimizations
+                                SET score = ?
+                                WHERE id = ?
+                            ''', (float(top_supplier['predicted_score']), optimization_id))
+                    except Exception as e:
+                        logging.warning(f"Could not update score: {e}")
+                
+                # Record the averages of the selected (top-ranked) suppliers
+                selected = suppliers_df[['cost', 'co2', 'delivery_time', 'ethical_score']].to_numpy(
+                    dtype=np.float64)[:SELECTED_SUPPLIERS]
+                averages = selected.mean(axis=0).tolist() if len(selected) else [None] * 4
+                conn.execute('''
+                    INSERT INTO optimization_trends (
+                        optimization_id, timestamp, avg_cost, avg_co2, avg_delivery, avg_ethical
                     )
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    optimization_id,
-                    row['name'],
-                    float(row['cost']),
-                    float(row['co2']),
-                    float(row['delivery_time']),
-                    float(row['ethical_score'])
-                ))
-            
-            logging.info("Successfully saved suppliers")
-            
-            # Update score if applicable
-            if 'score' in cols and len(suppliers_df) > 0:
-                # Save the score of the top supplier
-                try:
-                    top_supplier = suppliers_df.iloc[0]
-                    if 'predicted_score' in top_supplier:
-                        cursor.execute('''
-                            UPDATE optimizations
-                            SET score = ?
-                            WHERE id = ?
-                        ''', (float(top_supplier['predicted_score']), optimization_id))
-                except Exception as e:
-                    logging.warning(f"Could not update score: {e}")
-            
-            conn.commit()
-            logging.info(f"Successfully saved optimization {optimization_id}")
-            
-            return optimization_id
-        except Exception as e:
-            # Log and handle the error
-            logging.error(f"Error saving optimization: {e}")
-            if conn:
+                ''', (optimization_id, timestamp, *averages))
+                
+                conn.commit()
+                logging.info(f"Successfully saved optimization {optimization_id}")
+                
+                self._checkpoint_wal(conn, num_suppliers)
+                
+                return optimization_id
+            except Exception as e:
+                # Log and handle the error
+                logging.error(f"Error saving optimization: {e}")
                 conn.rollback()
-            # Don't raise, just return None to indicate failure
-            return None
-        finally:
-            if conn:
-                conn.close()
+                # Don't raise, just return None to indicate failure
+                return None
+    
+    def _checkpoint_wal(self, conn, rows_written):
+        """Checkpoint the WAL after a committed save, if the policy calls for it.
+        
+        Args:
+            conn (sqlite3.Connection): Connection with no open transaction.
+            rows_written (int): Number of supplier rows the save wrote.
+        """
+        with self._lock:
+            Database._commits_since_checkpoint += 1
+            periodic = Database._commits_since_checkpoint >= CHECKPOINT_EVERY
+        
+        try:
+            wal_size = os.path.getsize(self.db_path + '-wal')
+        except OSError:
+            wal_size = 0
+        
+        if rows_written > CHECKPOINT_TRUNCATE_ROWS or wal_size > WAL_TRUNCATE_BYTES:
+            mode = 'TRUNCATE'
+        elif periodic:
+            mode = 'PASSIVE'
+        else:
+            return
+        
+        try:
+            busy, log_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+            logger.debug(f"WAL checkpoint ({mode}): {checkpointed}/{log_pages} pages, busy={busy}")
+            with self._lock:
+                Database._commits_since_checkpoint = 0
+        except sqlite3.Error as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
     
     def get_optimizations(self, limit=10):
         """Get recent optimizations from the database.
@@ -409,13 +622,14 @@ class Database:
         
         with self.connection_pool.get_connection() as conn:
             try:
-                query = f"""
-                    SELECT id, timestamp, description, num_suppliers 
-                    FROM optimizations 
-                    ORDER BY timestamp DESC 
-                    LIMIT {limit}
+                query = """
+                    SELECT o.id, datetime(o.timestamp, 'unixepoch', 'localtime') AS timestamp,
+                           o.description, o.num_suppliers
+                    FROM optimizations o
+                    ORDER BY o.timestamp DESC
+                    LIMIT ?
                 """
-                df = pd.read_sql_query(query, conn)
+                df = self._read_frame(conn, query, (int(limit),))
                 logger.info(f"Retrieved {len(df)} optimizations")
                 return df
             except Exception as e:
@@ -435,14 +649,14 @@ class Database:
         
         with self.connection_pool.get_connection() as conn:
             try:
-                query = f"""
+                query = """
                     SELECT s.name, s.cost, s.co2, s.delivery_time, s.ethical_score, r.score as predicted_score, r.selected
                     FROM optimization_results r
                     JOIN suppliers s ON r.supplier_id = s.id
-                    WHERE r.optimization_id = {optimization_id}
+                    WHERE r.optimization_id = ?
                     ORDER BY r.score DESC
                 """
-                df = pd.read_sql_query(query, conn)
+                df = self._read_frame(conn, query, (int(optimization_id),))
                 logger.info(f"Retrieved {len(df)} results")
                 return df
             except Exception as e:
@@ -462,20 +676,14 @@ class Database:
         
         with self.connection_pool.get_connection() as conn:
             try:
-                query = f"""
-                    SELECT o.timestamp, 
-                           AVG(CASE WHEN r.selected = 1 THEN s.cost ELSE NULL END) as avg_cost,
-                           AVG(CASE WHEN r.selected = 1 THEN s.co2 ELSE NULL END) as avg_co2,
-                           AVG(CASE WHEN r.selected = 1 THEN s.delivery_time ELSE NULL END) as avg_delivery,
-                           AVG(CASE WHEN r.selected = 1 THEN s.ethical_score ELSE NULL END) as avg_ethical
-                    FROM optimizations o
-                    JOIN optimization_results r ON o.id = r.optimization_id
-                    JOIN suppliers s ON r.supplier_id = s.id
-                    GROUP BY o.id
-                    ORDER BY o.timestamp DESC
-                    LIMIT {limit}
+                query = """
+                    SELECT datetime(t.timestamp, 'unixepoch', 'localtime') AS timestamp,
+                           t.avg_cost, t.avg_co2, t.avg_delivery, t.avg_ethical
+                    FROM optimization_trends t
+                    ORDER BY t.timestamp DESC
+                    LIMIT ?
                 """
-                df = pd.read_sql_query(query, conn)
+                df = self._read_frame(conn, query, (int(limit),))
                 
                 # Reverse the order to have chronological order
                 if not df.empty:
@@ -487,9 +695,125 @@ class Database:
                 logger.error(f"Error getting optimization trends: {e}")
                 raise e
     
+    def _start_activity_writer(self):
+        """Start the background thread that writes queued activities."""
+        self._activity_queue = Queue(maxsize=ACTIVITY_QUEUE_SIZE)
+        self._activity_thread = threading.Thread(
+            target=self._activity_writer,
+            name='EthicSupply-activity-writer',
+            daemon=True
+        )
+        self._activity_thread.start()
+        atexit.register(self._stop_activity_writer)
+    
+    def _stop_activity_writer(self):
+        """Write any queued activities and stop the background writer."""
+        if self._activity_thread.is_alive():
+            self._activity_queue.put(_STOP)
+            self._activity_thread.join(timeout=10.0)
+        if not self._activity_thread.is_alive():
+            self._drain_activity_queue()
+    
+    def _drain_activity_queue(self):
+        """Write activities queued after the writer exited.
+        
+        log_activity can enqueue between its liveness check and the writer
+        taking its stop marker; writing those rows here keeps task_done()
+        balanced so waiting readers are not left hanging.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._activity_queue.get_nowait())
+            except Empty:
+                break
+        
+        rows = [item for item in batch if item is not _STOP]
+        try:
+            if rows:
+                self._insert_activities(rows)
+        except Exception:
+            # Already logged by _write_activities
+            pass
+        finally:
+            for _ in batch:
+                self._activity_queue.task_done()
+    
+    def _activity_writer(self):
+        """Drain the activity queue, committing each batch in one transaction."""
+        # A dedicated connection, so the writer never holds one of the pooled
+        # connections for the life of the process
+        conn = _connect(self.db_path)
+        try:
+            while True:
+                batch = [self._activity_queue.get()]
+                deadline = time.monotonic() + ACTIVITY_FLUSH_INTERVAL
+                while len(batch) < ACTIVITY_BATCH_SIZE and batch[-1] is not _STOP:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._activity_queue.get(timeout=remaining))
+                    except Empty:
+                        break
+                
+                rows = [item for item in batch if item is not _STOP]
+                try:
+                    if rows:
+                        self._write_activities(conn, rows)
+                except Exception:
+                    # Already logged by _write_activities; keep the writer alive
+                    pass
+                finally:
+                    for _ in batch:
+                        self._activity_queue.task_done()
+                
+                if len(rows) < len(batch):
+                    return
+        finally:
+            conn.close()
+    
+    def _insert_activities(self, rows):
+        """Insert activity rows in a single transaction on a pooled connection.
+        
+        Args:
+            rows (list): (timestamp, activity_type, description, details) tuples.
+        """
+        with self.connection_pool.get_connection() as conn:
+            self._write_activities(conn, rows)
+    
+    @staticmethod
+    def _write_activities(conn, rows):
+        """Insert activity rows in a single transaction.
+        
+        Args:
+            conn (sqlite3.Connection): Connection to write on.
+            rows (list): (timestamp, activity_type, description, details) tuples.
+        """
+        try:
+            # Start transaction
+            conn.execute("BEGIN")
+            
+            conn.executemany('''
+                INSERT INTO activities (timestamp, activity_type, description, details)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+            
+            # Commit transaction
+            conn.commit()
+            logger.debug(f"Wrote {len(rows)} activities")
+        except Exception as e:
+            # Rollback transaction on error
+            conn.rollback()
+            logger.error(f"Error logging activity: {e}")
+            raise e
+    
     def log_activity(self, activity_type, description, details=None):
         """Log an activity to the database.
         
+        The activity is queued and committed in a batch by a background
+        thread, so the caller never waits on the write.
+        
         Args:
             activity_type (str): Type of activity (e.g., 'input', 'optimize', 'export').
             description (str): Description of the activity.
@@ -497,30 +821,37 @@ class Database:
         """
         logger.info(f"Logging activity: {activity_type} - {description}")
         
-        with self.connection_pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
+        row = (int(time.time()), activity_type, description, details)
+        
+        if self._activity_thread.is_alive():
             try:
-                # Start transaction
-                cursor.execute("BEGIN")
-                
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                
-                cursor.execute('''
-                    INSERT INTO activities (timestamp, activity_type, description, details)
-                    VALUES (?, ?, ?, ?)
-                ''', (timestamp, activity_type, description, details))
-                
-                # Commit transaction
-                conn.commit()
-                logger.info("Activity logged successfully")
-            except Exception as e:
-                # Rollback transaction on error
-                conn.rollback()
-                logger.error(f"Error logging activity: {e}")
-                raise e
-            finally:
-                cursor.close()
+                self._activity_queue.put_nowait(row)
+                # The writer may have stopped after the check above
+                if not self._activity_thread.is_alive():
+                    self._drain_activity_queue()
+                return
+            except Full:
+                logger.warning("Activity queue is full, writing synchronously")
+        
+        self._insert_activities([row])
+        logger.info("Activity logged successfully")
+    
+    def _wait_for_activities(self, timeout):
+        """Wait until the activity queue is drained or the timeout expires.
+        
+        Args:
+            timeout (float): Maximum number of seconds to wait.
+            
+        Returns:
+            bool: True if no activities were left unwritten.
+        """
+        queue = self._activity_queue
+        with queue.all_tasks_done:
+            if not self._activity_thread.is_alive():
+                return queue.unfinished_tasks == 0
+            return queue.all_tasks_done.wait_for(
+                lambda: queue.unfinished_tasks == 0, timeout=timeout
+            )
     
     def get_recent_activities(self, limit=10):
         """Get recent activities from the database.
@@ -533,21 +864,44 @@ class Database:
         """
         logger.info(f"Fetching {limit} recent activities")
         
+        # Give queued activities a moment to be written so callers usually
+        # see their own writes, without blocking on a slow or stopped writer
+        self._wait_for_activities(ACTIVITY_READ_WAIT)
+        
         with self.connection_pool.get_connection() as conn:
             try:
-                query = f"""
-                    SELECT id, timestamp, activity_type, description, details
-                    FROM activities
-                    ORDER BY timestamp DESC
-                    LIMIT {limit}
+                query = """
+                    SELECT a.id, datetime(a.timestamp, 'unixepoch', 'localtime') AS timestamp,
+                           a.activity_type, a.description, a.details
+                    FROM activities a
+                    ORDER BY a.timestamp DESC
+                    LIMIT ?
                 """
-                df = pd.read_sql_query(query, conn)
+                df = self._read_frame(conn, query, (int(limit),))
                 logger.info(f"Retrieved {len(df)} activities")
                 return df
             except Exception as e:
                 logger.error(f"Error getting recent activities: {e}")
                 raise e
 
+@functools.lru_cache(maxsize=None)
+def _database_for(db_path):
+    """Create the Database for a resolved path; cached so it happens once."""
+    return Database(db_path)
+
+def get_database(db_path='ethicsupply_wal.db'):
+    """Get the shared Database instance for a database file.
+    
+    Args:
+        db_path (str, optional): Path to the database file. 
+            Defaults to 'ethicsupply_wal.db'.
+        
+    Returns:
+        Database: The instance for that file, created on first use.
+    """
+    # Resolve the path first so equivalent arguments share one cache entry
+    return _database_for(os.path.abspath(os.path.join(os.path.dirname(__file__), db_path)))
+
 if __name__ == "__main__":
     # Test the database functionality
     
@@ -567,7 +921,7 @@ if __name__ == "__main__":
     df = pd.DataFrame(suppliers)
     
     # Initialize database
-    db = Database()
+    db = get_database()
     
     # Save optimization
     optimization_id = db.save_optimization(df, "Test optimization")
@@ -25,10 +25,12 @@ def check_database_integrity(db_path):
         
         # Get database settings
         print("\nCurrent database settings:")
-        for pragma in ['journal_mode', 'synchronous', 'busy_timeout', 'locking_mode', 'foreign_keys']:
-            cursor.execute(f"PRAGMA {pragma};")
-            result = cursor.fetchone()
-            print(f"{pragma}: {result[0] if result else 'N/A'}")
+        # Read every setting in one query through the pragma_* table-valued functions
+        pragmas = ['journal_mode', 'synchronous', 'busy_timeout', 'locking_mode', 'foreign_keys']
+        cursor.execute("SELECT " + ", ".join(f"(SELECT * FROM pragma_{pragma})" for pragma in pragmas))
+        result = cursor.fetchone()
+        for pragma, value in zip(pragmas, result or [None] * len(pragmas)):
+            print(f"{pragma}: {value if value is not None else 'N/A'}")
         
         # Check for open transactions
         print("\nChecking for open transactions...")
@@ -3,25 +3,85 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton,
-    QScrollArea, QFrame
+    QFrame, QMainWindow, QLayout
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtGui import QFont, QColor, QPalette, QPainter, QStaticText, QTransform
+
+# Fonts and heading color shared by the labels on the page; set directly
+# instead of through the style sheet
+_TITLE_FONT = QFont("Arial", 24, QFont.Weight.Bold)
+_SECTION_FONT = QFont("Arial", 16, QFont.Weight.Bold)
+_HEADING_COLOR = QColor("#212529")
+
+def _heading(text, font):
+    """Create a heading label with the given font and the heading color."""
+    label = QLabel(text)
+    label.setFont(font)
+    palette = label.palette()
+    palette.setColor(QPalette.ColorRole.WindowText, _HEADING_COLOR)
+    label.setPalette(palette)
+    return label
+
+class StaticTextLabel(QLabel):
+    """Label for fixed multi-line plain text.
+    
+    The text is laid out once into a QStaticText and drawn from it, instead
+    of QLabel laying the text out again on each paint.
+    """
+    
+    def __init__(self, text, parent=None):
+        super().__init__(text, parent)
+        self._static_text = QStaticText(text)
+        self._static_text.setTextFormat(Qt.TextFormat.PlainText)
+        self._static_text.prepare(QTransform(), self.font())
+    
+    def changeEvent(self, event):
+        """Lay the text out again when the font changes."""
+        if event.type() == QEvent.Type.FontChange:
+            self._static_text.prepare(QTransform(), self.font())
+        super().changeEvent(event)
+    
+    def paintEvent(self, event):
+        """Draw the prepared text at the top left of the contents."""
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        painter.setPen(self.palette().color(self.foregroundRole()))
+        painter.drawStaticText(self.contentsRect().topLeft(), self._static_text)
 
 class AboutPage(QWidget):
     """About page showing application information and credits."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setup_ui()
+        
+        # MainWindow passes itself as the parent; the page is later moved
+        # into the content area, so keep the reference for navigation
+        self._main_window = parent if isinstance(parent, QMainWindow) else None
+        
+        # The page content is built the first time the page is shown
+        self._built = False
+    
+    def showEvent(self, event):
+        """Build the page content on first show."""
+        if not self._built:
+            self._built = True
+            # Paint once after the whole page is built, not per added widget
+            self.setUpdatesEnabled(False)
+            try:
+                self.setup_ui()
+            finally:
+                self.setUpdatesEnabled(True)
+        super().showEvent(event)
     
     def get_main_window(self):
-        """Get the main window from the parent widgets."""
-        from PyQt6.QtWidgets import QMainWindow
-        parent = self.parent()
-        while parent is not None and not isinstance(parent, QMainWindow):
-            parent = parent.parent()
-        return parent
+        """Get the main window, walking the parent widgets only once."""
+        if self._main_window is None:
+            parent = self.parent()
+            while parent is not None and not isinstance(parent, QMainWindow):
+                parent = parent.parent()
+            self._main_window = parent
+        return self._main_window
     
     def setup_ui(self):
         """Set up the about page UI."""
@@ -29,15 +89,10 @@ class AboutPage(QWidget):
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(20)
-        
-        # Create scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-            }
-        """)
+        # The content is added without a scroll area, so keep the page (and
+        # with it the window) from shrinking below what the content needs,
+        # e.g. with larger system fonts
+        layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
         
         # Create content widget
         content = QWidget()
@@ -45,24 +100,16 @@ class AboutPage(QWidget):
         content_layout.setSpacing(20)
         
         # Title
-        title = QLabel("About EthicSupply")
-        title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        title = _heading("About EthicSupply", _TITLE_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(title)
         
         # Application Information
         app_info = QFrame()
-        app_info.setStyleSheet("""
-            QFrame {
-                background-color: #F8F9FA;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        app_info.setObjectName("InfoCard")
         app_layout = QVBoxLayout(app_info)
         
-        app_title = QLabel("Application Information")
-        app_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        app_title = _heading("Application Information", _SECTION_FONT)
         app_layout.addWidget(app_title)
         
         app_details = QLabel(
@@ -79,20 +126,13 @@ class AboutPage(QWidget):
         
         # Developer Information
         dev_info = QFrame()
-        dev_info.setStyleSheet("""
-            QFrame {
-                background-color: #F8F9FA;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        dev_info.setObjectName("InfoCard")
         dev_layout = QVBoxLayout(dev_info)
         
-        dev_title = QLabel("Developer Information")
-        dev_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        dev_title = _heading("Developer Information", _SECTION_FONT)
         dev_layout.addWidget(dev_title)
         
-        dev_details = QLabel(
+        dev_details = StaticTextLabel(
             "Name: Mohammad Afsharfar\n"
             "Student ID: IZD6CT\n"
             "Email: ne3mer@gmail.com\n"
@@ -105,17 +145,10 @@ class AboutPage(QWidget):
         
         # Thesis Information
         thesis_info = QFrame()
-        thesis_info.setStyleSheet("""
-            QFrame {
-                background-color: #F8F9FA;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        thesis_info.setObjectName("InfoCard")
         thesis_layout = QVBoxLayout(thesis_info)
         
-        thesis_title = QLabel("Thesis Information")
-        thesis_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        thesis_title = _heading("Thesis Information", _SECTION_FONT)
         thesis_layout.addWidget(thesis_title)
         
         thesis_details = QLabel(
@@ -133,20 +166,13 @@ class AboutPage(QWidget):
         
         # Version Information
         version_info = QFrame()
-        version_info.setStyleSheet("""
-            QFrame {
-                background-color: #F8F9FA;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        version_info.setObjectName("InfoCard")
         version_layout = QVBoxLayout(version_info)
         
-        version_title = QLabel("Version Information")
-        version_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        version_title = _heading("Version Information", _SECTION_FONT)
         version_layout.addWidget(version_title)
         
-        version_details = QLabel(
+        version_details = StaticTextLabel(
             "Version: 1.0.0\n"
             "Release Date: March 2025\n"
             "Python Version: 3.8+\n"
@@ -157,26 +183,19 @@ class AboutPage(QWidget):
         
         content_layout.addWidget(version_info)
         
-        # Add content to scroll area
-        scroll.setWidget(content)
-        layout.addWidget(scroll)
+        # Add content to the page
+        layout.addWidget(content)
         
         # Back button
         back_button = QPushButton("Back to Dashboard")
-        back_button.setStyleSheet("""
-            QPushButton {
-                background-color: #007BFF;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #0056B3;
-            }
-        """)
-        back_button.clicked.connect(lambda: self.get_main_window().navigate_to('dashboard'))
+        back_button.setObjectName("BackButton")
+        back_button.clicked.connect(self._go_dashboard)
         layout.addWidget(back_button)
         
-        self.setLayout(layout) 
\ No newline at end of file
+        self.setLayout(layout)
+    
+    def _go_dashboard(self):
+        """Navigate back to the dashboard."""
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.navigate_to('dashboard')
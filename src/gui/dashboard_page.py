@@ -1,37 +1,121 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import random
-from datetime import datetime, timedelta
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import os
+import time
+import tempfile
+import functools
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QLabel, QFrame, QScrollArea, QSizePolicy, QGridLayout, QMainWindow
+    QLabel, QFrame, QGridLayout, QMainWindow
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QIcon, QColor
-from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtCore import Qt, QTimer, QUrl, QStandardPaths
+
+# pandas, Plotly and QtWebEngine are imported where the trend chart is
+# rendered, so they are not loaded until the dashboard is first shown
+
+# Maximum number of rendered trend charts kept in memory
+CHART_HTML_CACHE_SIZE = 8
+
+# Seconds a fetched set of optimization trends is reused for
+TRENDS_CACHE_TTL = 30.0
+
+@functools.lru_cache(maxsize=None)
+def plotly_js_dir():
+    """Return a directory holding a local copy of plotly.min.js.
+    
+    The copy lives in the per-user cache directory and is rewritten whenever
+    it does not match the installed Plotly bundle, so charts load the library
+    from disk instead of fetching it from the CDN on every show.
+    
+    Returns:
+        str: Path of the directory containing plotly.min.js.
+    """
+    import plotly
+    from plotly.offline import get_plotlyjs
+    
+    cache_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "ethicsupply")
+    directory = os.path.join(cache_dir, f"plotly-{plotly.__version__}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    
+    path = os.path.join(directory, "plotly.min.js")
+    expected = get_plotlyjs().encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            current = f.read()
+    except OSError:
+        current = None
+    
+    if current != expected:
+        # Write to a private temporary file first, so a reader never sees a
+        # partly written bundle
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(expected)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return directory
 
 class DashboardPage(QWidget):
     """Dashboard page with performance overview and recent activity."""
     
+    # Rendered trend chart HTML keyed by a hash of the trends it plots
+    _chart_html_cache = {}
+    
+    # Web view for the trend chart, shared across dashboard pages so its
+    # Chromium page is only brought up once, and the key of the HTML it shows
+    _shared_chart_view = None
+    _shared_chart_key = None
+    
+    # Styled trend chart figure without data, copied for each render
+    _figure_template = None
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
+        # MainWindow passes itself as the parent; the page is later moved
+        # into the content area, so keep the reference for navigation
+        self._main_window = parent if isinstance(parent, QMainWindow) else None
+        
         # Create main layout
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(20, 20, 20, 20)
         self.layout.setSpacing(20)
         
+        # The page content is built the first time the page is shown
+        self._built = False
+        
+        # (fetch time, trends) of the last optimization trends query
+        self._trends_cache = None
+    
+    def showEvent(self, event):
+        """Build the page content on first show and refresh the chart after."""
+        if not self._built:
+            self._built = True
+            # Paint once after the whole page is built, not per added widget
+            self.setUpdatesEnabled(False)
+            try:
+                self._build_ui()
+            finally:
+                self.setUpdatesEnabled(True)
+        else:
+            QTimer.singleShot(0, self.create_trend_chart)
+        super().showEvent(event)
+    
+    def invalidate_trends(self):
+        """Discard the cached trends so the next chart refresh queries them."""
+        self._trends_cache = None
+    
+    def _build_ui(self):
+        """Create the page title, performance charts and quick actions."""
         # Add page title
         self.title_label = QLabel("Performance Overview")
-        self.title_label.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #212529;
-        """)
+        self.title_label.setObjectName("PageTitle")
         self.layout.addWidget(self.title_label)
         
         # Create performance charts
@@ -49,74 +133,137 @@ class DashboardPage(QWidget):
         chart_frame = QFrame()
         chart_frame.setFrameShape(QFrame.Shape.StyledPanel)
         chart_frame.setFrameShadow(QFrame.Shadow.Raised)
-        chart_frame.setStyleSheet("""
-            background-color: white;
-            border: 1px solid #DEE2E6;
-            border-radius: 8px;
-        """)
+        chart_frame.setObjectName("Card")
         chart_layout = QVBoxLayout(chart_frame)
         chart_layout.setContentsMargins(15, 15, 15, 15)
         
         # Create section title
         section_title = QLabel("Optimization Trends")
-        section_title.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #212529;
-        """)
+        section_title.setObjectName("SectionTitle")
         chart_layout.addWidget(section_title)
         
-        # Create web view for Plotly chart
-        chart_view = QWebEngineView()
-        chart_view.setMinimumHeight(300)
-        chart_layout.addWidget(chart_view)
+        # Native label shown until there are trends to plot; the web view
+        # for the Plotly chart is only created once there is data
+        self.chart_message = QLabel("Loading optimization trends...")
+        self.chart_message.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.chart_message.setMinimumHeight(300)
+        chart_layout.addWidget(self.chart_message)
+        self.chart_layout = chart_layout
+        self.chart_view = None
         
-        # Create and set chart
-        self.create_trend_chart(chart_view)
+        # Create and set chart once the page frame has been painted
+        QTimer.singleShot(0, self.create_trend_chart)
         
         # Add chart frame to layout
         self.layout.addWidget(chart_frame)
     
-    def create_trend_chart(self, web_view):
-        """Create and set a trend chart in the web view.
+    def create_trend_chart(self):
+        """Create the trend chart, or show a message if there is no data."""
+        import pandas as pd
         
-        Args:
-            web_view (QWebEngineView): The web view to display the chart in.
-        """
         # Get real data from database
         main_window = self.get_main_window()
         if not main_window or not hasattr(main_window, 'db'):
             return
             
-        # Get optimization trends from database
-        trends_df = main_window.db.get_optimization_trends(limit=7)
+        # Get optimization trends from database, reusing a recent query
+        now = time.monotonic()
+        if self._trends_cache is not None and now - self._trends_cache[0] < TRENDS_CACHE_TTL:
+            trends_df = self._trends_cache[1]
+        else:
+            trends_df = main_window.db.get_optimization_trends(limit=7)
+            self._trends_cache = (now, trends_df)
         
         if trends_df.empty:
-            # Show "No data" message if no optimizations exist
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No optimization data available",
-                xref="paper",
-                yref="paper",
-                showarrow=False,
-                font=dict(size=14)
-            )
-            fig.update_layout(
-                plot_bgcolor="white",
-                margin=dict(l=50, r=50, t=30, b=80),
-            )
-            html = fig.to_html(include_plotlyjs='cdn')
-            web_view.setHtml(html)
+            # Show "No data" message without starting a web view
+            self.chart_message.setText("No optimization data available")
+            self.chart_message.show()
+            if self.chart_view is not None:
+                self.chart_view.hide()
             return
         
+        # Reuse the rendered chart while the trends are unchanged
+        key = hash(pd.util.hash_pandas_object(trends_df, index=True).values.tobytes())
+        html = self._chart_html_cache.get(key)
+        if html is None:
+            html = self.render_trend_chart(trends_df)
+            if len(self._chart_html_cache) >= CHART_HTML_CACHE_SIZE:
+                self._chart_html_cache.clear()
+            self._chart_html_cache[key] = html
+        
+        # Put the shared web view for the Plotly chart in place of the message
+        if self.chart_view is None:
+            self.chart_view = self.shared_chart_view()
+            self.chart_layout.addWidget(self.chart_view)
+        self.chart_message.hide()
+        self.chart_view.show()
+        
+        # Set the chart in the web view unless it already shows it;
+        # plotly.min.js is loaded from the local copy next to the base URL
+        if DashboardPage._shared_chart_key != key:
+            self.chart_view.setHtml(html, QUrl.fromLocalFile(plotly_js_dir() + os.sep))
+            DashboardPage._shared_chart_key = key
+    
+    @classmethod
+    def shared_chart_view(cls):
+        """Get the web view for the trend chart, creating it on first use.
+        
+        Returns:
+            QWebEngineView: The shared web view.
+        """
+        from PyQt6 import sip
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        
+        if cls._shared_chart_view is None or sip.isdeleted(cls._shared_chart_view):
+            cls._shared_chart_view = QWebEngineView()
+            cls._shared_chart_view.setMinimumHeight(300)
+            cls._shared_chart_key = None
+        return cls._shared_chart_view
+    
+    def render_trend_chart(self, trends_df):
+        """Render the optimization trends as Plotly HTML.
+        
+        Args:
+            trends_df (pd.DataFrame): Trends returned by the database.
+            
+        Returns:
+            str: The chart HTML, referencing a local plotly.min.js.
+        """
+        import plotly.graph_objects as go
+        
+        # Extract the columns once as NumPy arrays for Plotly to serialize
+        ts = trends_df['timestamp'].to_numpy()
+        cost = trends_df['avg_cost'].to_numpy(dtype='float64')
+        co2 = trends_df['avg_co2'].to_numpy(dtype='float64')
+        eth = trends_df['avg_ethical'].to_numpy(dtype='float64')
+        
+        # Copy the styled figure and fill in the trace data
+        fig = go.Figure(self.trend_figure_template())
+        fig.data[0].update(x=ts, y=cost)
+        fig.data[1].update(x=ts, y=co2)
+        fig.data[2].update(x=ts, y=eth)
+        
+        return fig.to_html(include_plotlyjs='directory')
+    
+    @classmethod
+    def trend_figure_template(cls):
+        """Get the styled trend chart figure without data, building it once.
+        
+        Returns:
+            go.Figure: Figure with the cost, CO2 and ethical score traces.
+        """
+        if cls._figure_template is not None:
+            return cls._figure_template
+        
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         # Create subplot figure
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
         # Add traces
         fig.add_trace(
             go.Scatter(
-                x=trends_df['timestamp'],
-                y=trends_df['avg_cost'],
                 name="Average Cost ($)",
                 line=dict(color="#007BFF", width=3)
             ),
@@ -125,8 +272,6 @@ class DashboardPage(QWidget):
         
         fig.add_trace(
             go.Scatter(
-                x=trends_df['timestamp'],
-                y=trends_df['avg_co2'],
                 name="Average CO2 (kg)",
                 line=dict(color="#28A745", width=3)
             ),
@@ -135,8 +280,6 @@ class DashboardPage(QWidget):
         
         fig.add_trace(
             go.Scatter(
-                x=trends_df['timestamp'],
-                y=trends_df['avg_ethical'],
                 name="Average Ethical Score",
                 line=dict(color="#6610F2", width=3)
             ),
@@ -162,9 +305,8 @@ class DashboardPage(QWidget):
         fig.update_yaxes(title_text="Cost ($) / CO2 (kg)", secondary_y=False)
         fig.update_yaxes(title_text="Ethical Score", secondary_y=True)
         
-        # Convert to HTML and set in web view
-        html = fig.to_html(include_plotlyjs='cdn')
-        web_view.setHtml(html)
+        cls._figure_template = fig
+        return fig
     
     def create_quick_actions(self):
         """Create quick actions section."""
@@ -172,21 +314,13 @@ class DashboardPage(QWidget):
         action_frame = QFrame()
         action_frame.setFrameShape(QFrame.Shape.StyledPanel)
         action_frame.setFrameShadow(QFrame.Shadow.Raised)
-        action_frame.setStyleSheet("""
-            background-color: white;
-            border: 1px solid #DEE2E6;
-            border-radius: 8px;
-        """)
+        action_frame.setObjectName("Card")
         action_layout = QVBoxLayout(action_frame)
         action_layout.setContentsMargins(15, 15, 15, 15)
         
         # Create section title
         section_title = QLabel("Quick Actions")
-        section_title.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #212529;
-        """)
+        section_title.setObjectName("SectionTitle")
         action_layout.addWidget(section_title)
         
         # Create button layout
@@ -195,54 +329,15 @@ class DashboardPage(QWidget):
         
         # Create buttons
         new_opt_btn = QPushButton("Start New Optimization")
-        new_opt_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #007BFF;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #0056B3;
-            }
-        """)
+        new_opt_btn.setObjectName("PrimaryAction")
         new_opt_btn.clicked.connect(self.start_new_optimization)
         
         load_data_btn = QPushButton("Load Existing Data")
-        load_data_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #007BFF;
-                border: 1px solid #007BFF;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #E3F2FD;
-            }
-        """)
+        load_data_btn.setObjectName("SecondaryAction")
         load_data_btn.clicked.connect(self.load_existing_data)
         
         sample_data_btn = QPushButton("Load Sample Data")
-        sample_data_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #007BFF;
-                border: 1px solid #007BFF;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #E3F2FD;
-            }
-        """)
+        sample_data_btn.setObjectName("SecondaryAction")
         sample_data_btn.clicked.connect(self.load_sample_data)
         
         # Add buttons to layout
@@ -260,13 +355,17 @@ class DashboardPage(QWidget):
     def get_main_window(self):
         """Get the main window from the parent widgets.
         
+        The result is cached, so the parent chain is walked at most once.
+        
         Returns:
             QMainWindow: The main window.
         """
-        parent = self.parent()
-        while parent is not None and not isinstance(parent, QMainWindow):
-            parent = parent.parent()
-        return parent
+        if self._main_window is None:
+            parent = self.parent()
+            while parent is not None and not isinstance(parent, QMainWindow):
+                parent = parent.parent()
+            self._main_window = parent
+        return self._main_window
     
     def start_new_optimization(self):
         """Start a new optimization process."""
@@ -287,6 +386,18 @@ class DashboardPage(QWidget):
         if main_window:
             main_window.navigate_to('input')
     
+    def _go_input(self):
+        """Navigate to the input page."""
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.navigate_to('input')
+    
+    def _go_results(self):
+        """Navigate to the results page."""
+        main_window = self.get_main_window()
+        if main_window:
+            main_window.navigate_to('results')
+    
     def create_dashboard_content(self, layout):
         """Create the main dashboard content."""
         # Create grid layout for metrics
@@ -315,38 +426,12 @@ class DashboardPage(QWidget):
         
         # Create buttons
         input_btn = QPushButton("Input Data")
-        input_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #007BFF;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #0056B3;
-            }
-        """)
-        input_btn.clicked.connect(lambda: self.get_main_window().navigate_to('input'))
+        input_btn.setObjectName("PrimaryAction")
+        input_btn.clicked.connect(self._go_input)
         
         results_btn = QPushButton("View Results")
-        results_btn.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                color: #007BFF;
-                border: 1px solid #007BFF;
-                border-radius: 8px;
-                padding: 10px 15px;
-                font-size: 14px;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #E3F2FD;
-            }
-        """)
-        results_btn.clicked.connect(lambda: self.get_main_window().navigate_to('results'))
+        results_btn.setObjectName("SecondaryAction")
+        results_btn.clicked.connect(self._go_results)
         
         # Add buttons to layout
         button_layout.addWidget(input_btn)
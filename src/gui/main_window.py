@@ -16,7 +16,8 @@ from .settings_page import SettingsPage
 from .about_page import AboutPage
 from .recent_activity_page import RecentActivityPage
 from .sidebar import Sidebar
-from src.data.database_pool import Database
+from .styles import APP_STYLESHEET
+from src.data.database_pool import get_database
 
 class MainWindow(QMainWindow):
     """Main window of the application."""
@@ -25,7 +26,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         # Initialize database
-        self.db = Database()
+        self.db = get_database()
         
         # Set window properties
         self.setWindowTitle("EthicSupply")
@@ -74,12 +75,8 @@ class MainWindow(QMainWindow):
         # Log application start
         self.db.log_activity('start', 'Application started')
         
-        # Set window style
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #F8F9FA;
-            }
-        """)
+        # Set window style; pages pick up their shared rules by object name
+        self.setStyleSheet(APP_STYLESHEET)
     
     def navigate_to(self, page_name):
         """Navigate to the specified page."""
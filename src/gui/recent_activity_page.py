@@ -9,7 +9,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from datetime import datetime, timedelta
 import pandas as pd
-from src.data.database_pool import Database
+from src.data.database_pool import get_database
 
 class RecentActivityPage(QWidget):
     """Page to display recent activity in the application."""
@@ -18,7 +18,7 @@ class RecentActivityPage(QWidget):
         super().__init__(parent)
         
         # Initialize database
-        self.db = Database()
+        self.db = get_database()
         
         # Create main layout
         self.layout = QVBoxLayout(self)
@@ -234,16 +234,16 @@ class RecentActivityPage(QWidget):
         # Navigate based on activity type
         if activity_type in ["input", "add", "update"]:
             # Navigate to input page
-            main_window.navigate_to(1)
+            main_window.navigate_to('input')
         elif activity_type in ["optimize", "refresh"]:
             # Navigate to results page
-            main_window.navigate_to(2)
+            main_window.navigate_to('results')
         elif activity_type == "export":
             # Show export dialog
             self.show_export_dialog()
         elif activity_type == "settings":
             # Navigate to settings page
-            main_window.navigate_to(4)
+            main_window.navigate_to('settings')
     
     def show_export_dialog(self):
         """Show export dialog for results."""
@@ -285,7 +285,7 @@ class RecentActivityPage(QWidget):
         """Navigate back to the dashboard."""
         main_window = self.get_main_window()
         if main_window:
-            main_window.navigate_to(0)
+            main_window.navigate_to('dashboard')
     
     def get_main_window(self):
         """Get the main window from the parent widgets.
@@ -887,6 +887,9 @@ class ResultsPage(QWidget):
                 f"Optimization run with {len(suppliers_data)} suppliers using {model_used}"
             )
             
+            # The dashboard trends now include this optimization
+            main_window.pages['dashboard'].invalidate_trends()
+            
             # Log activity
             main_window.db.log_activity(
                 'optimize',
@@ -1557,7 +1560,7 @@ class ResultsPage(QWidget):
         """Navigate back to the dashboard."""
         main_window = self.get_main_window()
         if main_window:
-            main_window.navigate_to(0)
+            main_window.navigate_to('dashboard')
     
     def get_main_window(self):
         """Get the main window from the parent widgets.
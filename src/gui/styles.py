@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared Qt style sheets for the EthicSupply pages.
+
+The rules select widgets by object name and are installed once on the main
+window, so each page only calls setObjectName() instead of parsing its own
+per-widget style sheet.
+"""
+
+import re
+
+def _qss(style):
+    """Collapse the whitespace of a style sheet so Qt has less to scan."""
+    return re.sub(r"\s+", " ", style).strip()
+
+# Main window background
+MAIN_WINDOW = _qss("""
+    QMainWindow {
+        background-color: #F8F9FA;
+    }
+""")
+
+# Page heading, e.g. "Performance Overview"
+PAGE_TITLE = _qss("""
+    QLabel#PageTitle {
+        font-size: 24px;
+        font-weight: bold;
+        color: #212529;
+    }
+""")
+
+# Heading of a card section, e.g. "Quick Actions"
+SECTION_TITLE = _qss("""
+    QLabel#SectionTitle {
+        font-size: 18px;
+        font-weight: bold;
+        color: #212529;
+    }
+""")
+
+# White bordered card holding a dashboard section
+CARD = _qss("""
+    QFrame#Card {
+        background-color: white;
+        border: 1px solid #DEE2E6;
+        border-radius: 8px;
+    }
+""")
+
+# Grey information card on the about page
+INFO_CARD = _qss("""
+    QFrame#InfoCard {
+        background-color: #F8F9FA;
+        border-radius: 10px;
+        padding: 15px;
+    }
+""")
+
+# Filled blue button for the main action of a section
+PRIMARY_ACTION = _qss("""
+    QPushButton#PrimaryAction {
+        background-color: #007BFF;
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px 15px;
+        font-size: 14px;
+        min-width: 150px;
+    }
+    QPushButton#PrimaryAction:hover {
+        background-color: #0056B3;
+    }
+""")
+
+# Outlined blue button for the other actions of a section
+SECONDARY_ACTION = _qss("""
+    QPushButton#SecondaryAction {
+        background-color: transparent;
+        color: #007BFF;
+        border: 1px solid #007BFF;
+        border-radius: 8px;
+        padding: 10px 15px;
+        font-size: 14px;
+        min-width: 150px;
+    }
+    QPushButton#SecondaryAction:hover {
+        background-color: #E3F2FD;
+    }
+""")
+
+# "Back to Dashboard" button
+BACK_BUTTON = _qss("""
+    QPushButton#BackButton {
+        background-color: #007BFF;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 5px;
+        font-size: 14px;
+    }
+    QPushButton#BackButton:hover {
+        background-color: #0056B3;
+    }
+""")
+
+# Style sheet installed on the main window
+APP_STYLESHEET = " ".join((
+    MAIN_WINDOW,
+    PAGE_TITLE,
+    SECTION_TITLE,
+    CARD,
+    INFO_CARD,
+    PRIMARY_ACTION,
+    SECONDARY_ACTION,
+    BACK_BUTTON,
+))
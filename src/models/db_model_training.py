@@ -16,7 +16,7 @@ from datetime import datetime
 # Add parent directory to the path to correctly import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.data.database_pool import Database
+from src.data.database_pool import get_database
 from src.models.supplier_model import SupplierModel, SupplierOptimizer, normalize_supplier_data
 
 # Set up logging
@@ -37,7 +37,7 @@ class DatabaseModelTrainer:
                 If None, a new model will be created. Defaults to None.
         """
         # Initialize database connection
-        self.db = Database()
+        self.db = get_database()
         
         # Initialize the model
         self.supplier_model = SupplierModel(model_path)